@@ -0,0 +1,149 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Basins of attraction and transient lengths
+#
+#  All functions work on stacked transition arrays of shape (K, 2^N) (see
+#  `transitions.batch_transition_table`). Every attractor is labelled by
+#  the smallest state code on it. Labels and transient lengths are found
+#  by pointer jumping: table of the 2^j-th successor and of the smallest
+#  state visited in the first 2^j steps are doubled N times, hence whole
+#  batch needs only O(N) vectorized passes over its states. Only the
+#  current tables are kept, so memory does not grow with N.
+
+import heapq
+
+import numpy as np
+
+from BooleanTRN.helpers.common import iter_chunks
+from BooleanTRN.helpers.constants import *
+from BooleanTRN.models.transitions import (state_to_code, stack_node_masks,
+                                           batch_transition_table)
+
+
+def _take(table: np.ndarray, index: np.ndarray) -> np.ndarray:
+    return np.take_along_axis(table, index, axis=1)
+
+
+def batch_basins(transitions) -> tuple:
+    """
+    Attractor reached by every state and number of steps needed to reach it
+    :param transitions: Successor arrays of shape (K, 2^N) (single array
+    of length 2^N is also accepted)
+    :return: labels, transient lengths and boolean array of states on
+    attractors, each of shape (K, 2^N). Label is the smallest state code
+    of the reached attractor.
+    """
+    transitions = np.atleast_2d(np.asarray(transitions, dtype=np.int64))
+    size = transitions.shape[1]
+    steps = max(size.bit_length() - 1, 1)
+
+    # jump is the 2^j-th successor, smallest is the smallest state among
+    # first 2^j states of the trajectory
+    jump = transitions
+    smallest = np.broadcast_to(np.arange(size, dtype=np.int64),
+                               transitions.shape)
+    for _ in range(steps):
+        smallest = np.minimum(smallest, _take(smallest, jump))
+        jump = _take(jump, jump)
+
+    # After 2^N steps every trajectory is on its attractor and first 2^N
+    # states of trajectory from attractor cover the whole attractor
+    labels = _take(smallest, jump)
+    cyclic = np.zeros(transitions.shape, dtype=bool)
+    np.put_along_axis(cyclic, jump, True, axis=1)
+    del smallest
+
+    # Second doubling pass for the transient lengths. After j doublings
+    # transients holds the number of steps to the attractor capped at 2^j.
+    # State which reached the cap needs 2^j steps more than the state 2^j
+    # steps ahead of it.
+    jump = transitions
+    transients = (~cyclic).astype(np.int64)
+    for j in range(steps):
+        capped = transients == (1 << j)
+        transients = np.where(capped, (1 << j) + _take(transients, jump),
+                              transients)
+        if j < steps - 1:
+            jump = _take(jump, jump)
+    return labels, transients, cyclic
+
+
+def basin_statistics(transitions) -> dict:
+    """
+    Basin of every attractor of a single network
+    :param transitions: Successor array of length 2^N
+    :return: Dictionary of attractor label -> dictionary with attractor
+    states (in the order of transitions), basin size, fraction of the state
+    space, mean and maximum transient length in the basin
+    """
+    successors = np.asarray(transitions).tolist()
+    labels, transients, _ = batch_basins(transitions)
+    labels, transients = labels[0], transients[0]
+    keys, sizes = np.unique(labels, return_counts=True)
+    stats = {}
+    for key, size in zip(keys.tolist(), sizes.tolist()):
+        attractor = [key]
+        while successors[attractor[-1]] != key:
+            attractor.append(successors[attractor[-1]])
+        basin = transients[labels == key]
+        stats[key] = {
+            "attractor": attractor,
+            "size": size,
+            "fraction": size / len(successors),
+            "mean_transient": float(basin.mean()),
+            "max_transient": int(basin.max())
+        }
+    return stats
+
+
+def target_basin_fractions(transitions, target: list) -> tuple:
+    """
+    Fraction of the state space which reaches the attractor of every
+    target state. Target which is not on any attractor has fraction 0.
+    :param transitions: Successor arrays of shape (K, 2^N)
+    :param target: List of state strings (e.g. "10110")
+    :return: Array of shape (K, len(target)) with fraction for each target
+    and array of shape (K,) with fraction of states which reach any of the
+    targets (targets sharing an attractor are counted once)
+    """
+    labels, _, cyclic = batch_basins(transitions)
+    codes = np.asarray([state_to_code(x) for x in target], dtype=np.int64)
+    # Label -1 never matches, hence transient targets get empty basins
+    wanted = np.where(cyclic[:, codes], labels[:, codes], -1)
+    reached = labels[:, :, None] == wanted[:, None, :]
+    return reached.mean(axis=1), reached.any(axis=2).mean(axis=1)
+
+
+def rank_networks(networks, no_of_nodes: int, target: list, *,
+                  batch_size: int = 1000,
+                  top: int = None,
+                  default_gate: int = GATE_OR) -> list:
+    """
+    Sorts networks by the fraction of the state space which ends in one of
+    the target attractors. Networks are evaluated in batches, hence
+    arbitrary long input (e.g. `iter_networks(filename)`) can be ranked.
+    :param networks: Iterable of networks in the tuple format or packed
+    networks
+    :param no_of_nodes: Number of nodes in each network
+    :param target: List of state strings (e.g. "10110")
+    :param batch_size: Number of networks evaluated together
+    :param top: If given, only this many best networks are kept in memory
+    and returned
+    :param default_gate: Gate used when edge does not specify any gate
+    :return: List of (fraction, per-target fractions, network) sorted from
+    the largest fraction. Ties keep the input order.
+    """
+
+    def _scored():
+        for batch in iter_chunks(networks, batch_size):
+            masks = stack_node_masks(batch, no_of_nodes, default_gate)
+            transitions = batch_transition_table(masks, no_of_nodes)
+            each, total = target_basin_fractions(transitions, target)
+            yield from zip(total.tolist(), each.tolist(), batch)
+
+    key = (lambda x: x[0])
+    if top is None:
+        return sorted(_scored(), key=key, reverse=True)
+    return heapq.nlargest(top, _scored(), key=key)
@@ -5,28 +5,20 @@
 #  Analysis related to networks and related functionalities
 
 import json
+import math
 import os
 import shutil
-import uuid
 from collections import defaultdict
-from multiprocessing import Queue, Process
+from multiprocessing import Pool
 
-import networkx as nx
-
-from BooleanTRN.helpers.common import load_networks, find_isomorphic_networks
+from BooleanTRN.helpers.common import (iter_networks, iter_chunks,
+                                       imap_bounded, canonical_form)
 from BooleanTRN.helpers.constants import *
+from BooleanTRN.helpers.instrumentation import (Metrics, get_metrics,
+                                                print_progress)
+from BooleanTRN.models.attractors import transition_signature
 from BooleanTRN.models.combinations import NetworkCombinations
-
-
-def _save_to_file(que: Queue, networks, folder, show_progress):
-    filename = f"{folder}/{uuid.uuid4()}"
-    nets = find_isomorphic_networks(networks)
-    if show_progress:
-        print(f"PID :{os.getpid()} - Currently Generating : {filename}")
-    with open(filename, "w") as f:
-        for n in nets:
-            print(json.dumps(n), file=f)
-    que.put(filename)
+from BooleanTRN.models.packed import is_packed, unpack_network
 
 
 def generate_ss_networks(no_of_nodes: int, no_of_edges: int,
@@ -35,7 +27,30 @@ def generate_ss_networks(no_of_nodes: int, no_of_edges: int,
                          is_connected: bool = True,
                          gates: list = None,
                          show_progress: bool = True,
+                         ignore_oscillations: bool = False,
+                         non_isomorphic: bool = False,
+                         shards: int = None,
+                         workers: int = None,
+                         metrics: Metrics = None,
                          filename="networks.txt"):
+    """
+    Writes all networks which have given steady states
+    :param no_of_nodes: Number of nodes
+    :param no_of_edges: Number of edges
+    :param steady_states: List of target states (e.g. "10110")
+    :param interactions: Allowed interactions
+    :param is_connected: Only connected networks
+    :param gates: Allowed gates
+    :param show_progress: Print progress
+    :param ignore_oscillations: Accept targets only as fixed points
+    :param non_isomorphic: Write only one network from every isomorphism
+    class
+    :param shards: If given, edge sets are split into this many ranges
+    which are scanned in parallel and can be resumed after interruption
+    :param workers: Number of worker processes in sharded mode
+    :param metrics: `Metrics` which receives counters of `find`
+    :param filename: Output file
+    """
     if interactions is None:
         interactions = [INTERACTION_POSITIVE]
     if gates is None:
@@ -44,183 +59,240 @@ def generate_ss_networks(no_of_nodes: int, no_of_edges: int,
                              only_connected=is_connected)
     nc.interactions = interactions
     nc.gates = gates
+    options = {
+        "ignore_oscillations": ignore_oscillations,
+        "non_isomorphic": non_isomorphic
+    }
+    metrics = get_metrics(metrics, show_progress)
+    if shards is not None:
+        _generate_sharded(nc, steady_states, options, shards,
+                          workers, metrics, filename)
+        return
     with open(filename, "w") as f:
-        for n in nc.find(steady_states, show_progress=show_progress):
+        for n in nc.find(steady_states, metrics=metrics, **options):
             data = json.dumps(n)
             print(data, file=f)
 
 
-def _wrap_generate_iso_networks(networks: list,
-                                *,
-                                chunks=1000,
-                                show_progress=True,
-                                clean_old=True,
-                                filename="isomorphs.txt",
-                                temp_folder="_temp",
-                                change_factor=2,
-                                previous_count=None):
-    if not os.path.exists(temp_folder):
-        os.mkdir(temp_folder)
-    else:
-        if clean_old and previous_count is None:
-            shutil.rmtree(temp_folder)
-            os.mkdir(temp_folder)
-
-    network_split = []
-    tmp = []
-    main_queue = Queue()
-    for n in networks:
-        tmp.append(n)
-        if len(tmp) >= chunks:
-            p = Process(target=_save_to_file,
-                        args=(main_queue, tmp, temp_folder, show_progress))
-            p.start()
-            network_split.append(1)
-            tmp = []
-    if len(tmp) > 0:
-        p = Process(target=_save_to_file,
-                    args=(main_queue, tmp, temp_folder, show_progress))
-        p.start()
-        network_split.append(1)
-
-    all_files = []
-    for _ in network_split:
-        all_files.append(main_queue.get())
-
-    # Combine all temporary files
-    with open(filename, 'w') as wfd:
-        for f in all_files:
-            with open(f, 'r') as fd:
-                shutil.copyfileobj(fd, wfd)
-
-    if len(networks) <= chunks:
-        return
-    else:
-        chunks = change_factor * chunks
+def _scan_shard(data: tuple) -> tuple:
+    nc, steady_states, options, index, start, stop, filename = data
+    metrics = Metrics()
+    # Shard becomes visible only after it is completely written
+    with open(f"{filename}.tmp", "w") as f:
+        for n in nc.find(steady_states, start=start, stop=stop,
+                         metrics=metrics, **options):
+            print(json.dumps(n), file=f)
+    os.replace(f"{filename}.tmp", filename)
+    return index, metrics.snapshot()
+
+
+def _generate_sharded(nc: NetworkCombinations, steady_states: list,
+                      options: dict, shards: int, workers: int,
+                      metrics: Metrics, filename: str):
+    total = nc.get_pair_count()
+    size = max(math.ceil(total / shards), 1)
+    ranges = [(i, i * size, min((i + 1) * size, total))
+              for i in range(shards) if i * size < total]
+    settings = {
+        "no_of_nodes": nc.no_of_nodes,
+        "no_of_edges": nc.no_of_edges,
+        "steady_states": steady_states,
+        "interactions": nc.interactions,
+        "gates": nc.gates,
+        "is_connected": nc.is_connected,
+        **options,
+        "shards": shards
+    }
+
+    manifest_file = f"{filename}.manifest"
+    completed = set()
+    if os.path.exists(manifest_file):
+        with open(manifest_file) as f:
+            manifest = json.load(f)
+        if manifest["settings"] != settings:
+            raise ValueError(f"Manifest {manifest_file} was created with "
+                             f"different settings. Remove it to start "
+                             f"new run.")
+        completed = set(manifest["completed"])
+
+    def _shard_file(index):
+        return f"{filename}.shard{index:05d}"
+
+    # Shard which is marked as completed but missing on the disk is
+    # scanned again
+    completed = set([i for i in completed if os.path.exists(_shard_file(i))])
+
+    def _save_manifest():
+        with open(f"{manifest_file}.tmp", "w") as f:
+            json.dump({"settings": settings,
+                       "completed": sorted(completed)}, f)
+        os.replace(f"{manifest_file}.tmp", manifest_file)
+
+    pending = [(nc, steady_states, options, i, a, b,
+                _shard_file(i)) for i, a, b in ranges if i not in completed]
+    metrics.count("shards", len(completed))
+    with Pool(workers) as pool:
+        for index, snapshot in pool.imap_unordered(_scan_shard, pending):
+            completed.add(index)
+            _save_manifest()
+            metrics.merge(snapshot)
+            metrics.count("shards")
+    metrics.report(force=True)
+
+    # Manifest is removed before the shards, hence an interrupted clean-up
+    # never leaves a manifest which lists deleted shards
+    with open(f"{filename}.tmp", "w") as f:
+        for i, _, _ in ranges:
+            with open(_shard_file(i)) as fd:
+                shutil.copyfileobj(fd, f)
+    os.replace(f"{filename}.tmp", filename)
+    os.remove(manifest_file)
+    for i, _, _ in ranges:
+        os.remove(_shard_file(i))
+
+
+def _to_json(network, no_of_nodes: int) -> str:
+    if is_packed(network):
+        network = unpack_network(network, no_of_nodes)
+    return json.dumps(network)
+
+
+def _canonical_chunk(data: tuple) -> tuple:
+    networks, no_of_nodes = data
+    metrics = Metrics()
+    # Only locally unique networks are sent back to the parent
+    seen = set()
+    unique = []
+    with metrics.stage("canonical_form"):
+        for n in networks:
+            key = canonical_form(n, no_of_nodes)
+            if key not in seen:
+                seen.add(key)
+                unique.append((key, n))
+    metrics.count("canonical_forms", len(networks))
+    return unique, metrics.snapshot()
+
+
+def generate_iso_networks(networks,
+                          *,
+                          chunks=1000,
+                          workers: int = None,
+                          show_progress=True,
+                          no_of_nodes: int = None,
+                          metrics: Metrics = None,
+                          filename="isomorphs.txt"):
+    """
+    Writes first network of every isomorphism class. Canonical forms are
+    computed by fixed pool of workers and merged by the parent in a single
+    pass over the input. Input is consumed lazily with at most two chunks
+    per worker in flight.
+    :param networks: Iterable of networks (e.g. `iter_networks(filename)`)
+    :param chunks: Number of networks sent to a worker at once
+    :param workers: Number of worker processes (default: CPU count)
+    :param show_progress: Print progress
+    :param no_of_nodes: Number of nodes (needed only for packed networks)
+    :param metrics: `Metrics` which receives counters and stage timers of
+    all workers
+    :param filename: Output file
+    :return: Number of non-isomorphic networks
+    """
+    workers = workers or os.cpu_count()
+    metrics = get_metrics(metrics, show_progress)
+    seen = set()
+    with Pool(workers) as pool, open(filename, "w") as f:
+        data = ((x, no_of_nodes) for x in iter_chunks(networks, chunks))
+        results = imap_bounded(pool, _canonical_chunk, data, 2 * workers)
+        for unique, snapshot in results:
+            metrics.merge(snapshot)
+            for key, n in unique:
+                if key not in seen:
+                    seen.add(key)
+                    print(_to_json(n, no_of_nodes), file=f)
+                    metrics.count("isomorphs")
+            metrics.report()
+    metrics.report(force=True)
+    if show_progress:
+        print("")
+    return len(seen)
 
-    new_nets = load_networks(filename)
 
-    if len(new_nets) == len(networks):
-        chunks = len(networks) + 1
+# NetworkCombinations of the worker process, set once by the pool
+# initializer instead of being pickled with every chunk
+_worker_nc = None
 
-    if previous_count is not None:
-        print("=========================================")
-        print("Starting next round of isomorph searching")
 
-    _wrap_generate_iso_networks(new_nets,
-                                chunks=chunks,
-                                show_progress=show_progress,
-                                filename=filename,
-                                clean_old=clean_old,
-                                temp_folder=temp_folder,
-                                previous_count=len(networks))
+def _init_ss_worker(nc: NetworkCombinations):
+    global _worker_nc
+    _worker_nc = nc
 
 
-def generate_iso_networks(networks: list,
-                          *,
-                          chunks=1000,
-                          show_progress=True,
-                          clean_old=True,
-                          filename="isomorphs.txt",
-                          temp_folder="_temp",
-                          change_factor=2,
-                          previous_count=None):
-    print("Starting first round of searching")
-    print("==================================")
-    _wrap_generate_iso_networks(networks, chunks=chunks,
-                                show_progress=show_progress,
-                                clean_old=clean_old,
-                                filename=filename,
-                                temp_folder=temp_folder,
-                                previous_count=previous_count,
-                                change_factor=change_factor)
-
-    print("====================================")
-    print("Analysis finished, cleaning up temporary files")
-    shutil.rmtree(temp_folder)
-
-
-def _wrap_ss_isomorphs(q: Queue, networks: list,
-                       nc: NetworkCombinations, chunk_no: int):
-    print(f"Analysing chunk {chunk_no + 1}")
-    graphs = []
+def _wrap_ss_isomorphs(networks: list) -> tuple:
+    nc = _worker_nc
+    metrics = Metrics()
     nets = defaultdict(list)
-    for n in networks:
-        g = nx.MultiDiGraph()
-        for ss in nc.get_state_space(n).items():
-            g.add_edge(ss[0], ss[1])
-        if len(graphs) == 0:
-            graphs.append(g)
-            nets[g].append(n)
-        else:
-            tmp = [nx.is_isomorphic(x, g) for x in graphs]
-            if not any(tmp):
-                graphs.append(g)
-                nets[g].append(n)
-            else:
-                nets[graphs[tmp.index(True)]].append(n)
-    del graphs
-    q.put(list(nets.values()))
+    with metrics.stage("transition_signature"):
+        for n in networks:
+            nets[transition_signature(nc.get_transitions(n))].append(n)
+    metrics.count("signatures", len(networks))
+    return list(nets.items()), metrics.snapshot()
 
 
 def get_steady_state_isomorphs(networks,
                                nc: NetworkCombinations,
                                chunks=200,
+                               workers: int = None,
+                               max_pending: int = None,
+                               show_progress: bool = True,
+                               metrics: Metrics = None,
                                filename="ss_isomorphs.txt"):
-    main_queue = Queue()
-    current = []
-    all_process = []
-    for n in networks:
-        current.append(n)
-        if len(current) >= chunks:
-            p = Process(target=_wrap_ss_isomorphs,
-                        args=(main_queue, current, nc, len(all_process)))
-            p.start()
-            all_process.append(1)
-            current = []
-
-    if len(current) > 0:
-        p = Process(target=_wrap_ss_isomorphs,
-                    args=(main_queue, current, nc, len(all_process)))
-        p.start()
-        all_process.append(1)
-
-    sub_iso = []
-    for _ in all_process:
-        sub_iso.append(main_queue.get())
-        print(f"Collected results for {len(sub_iso)} chunks")
-
-    final_ss = []
-    rep_ss = []
-    print("Combining chunks...")
-    for sub in sub_iso:
-        for s in sub:
-            rep = s[0]
-            g = nx.MultiDiGraph()
-            for ss in nc.get_state_space(rep).items():
-                g.add_edge(ss[0], ss[1])
-            if len(final_ss) == 0:
-                final_ss.append(s)
-                rep_ss.append(g)
-                continue
-            else:
-                tmp = [nx.is_isomorphic(x, g) for x in rep_ss]
-                if not any(tmp):
-                    rep_ss.append(g)
-                    final_ss.append(s)
-                else:
-                    final_ss[tmp.index(True)].extend(s)
-
-    print(f"Finished Analysing. Total '{len(final_ss)}' SS-isomorphs found.")
-    count = -1
-    with open(filename, "w") as f:
-        for s in final_ss:
-            count += 1
-            for x in s:
-                print(f"{count}:{json.dumps(x)}", file=f)
+    """
+    Groups networks whose state transition graphs are isomorphic. Every
+    network is reduced to the canonical signature of its transition graph,
+    hence the chunks are merged by simple dictionary lookup. Input is
+    consumed lazily by fixed pool of workers with at most `max_pending`
+    chunks in flight, and networks are written as soon as their chunk is
+    analysed, so only one representative per group is kept in memory.
+    Results are merged in the input order, hence the output does not
+    depend on the number of workers.
+    :param networks: Iterable of networks (e.g. `iter_networks(filename)`)
+    :param nc: NetworkCombinations used to build the state space (sent
+    only once to every worker)
+    :param chunks: Number of networks analysed by single worker at once
+    :param workers: Number of worker processes (default: CPU count)
+    :param max_pending: Maximum number of chunks submitted but not yet
+    merged (default: twice the number of workers)
+    :param show_progress: Print progress
+    :param metrics: `Metrics` which receives counters and stage timers of
+    all workers
+    :param filename: Output file, each line is "group:network"
+    :return: List with first network of every group
+    """
+    workers = workers or os.cpu_count()
+    max_pending = max_pending or 2 * workers
+    metrics = get_metrics(metrics, show_progress)
+    groups = {}
+    representatives = []
+    with Pool(workers, initializer=_init_ss_worker, initargs=(nc,)) as pool, \
+            open(filename, "w") as f:
+        results = imap_bounded(pool, _wrap_ss_isomorphs,
+                               iter_chunks(networks, chunks), max_pending)
+        for sub, snapshot in results:
+            metrics.merge(snapshot)
+            for key, group in sub:
+                if key not in groups:
+                    groups[key] = len(representatives)
+                    representatives.append(group[0])
+                    metrics.count("ss_isomorphs")
+                for x in group:
+                    print(f"{groups[key]}:{_to_json(x, nc.no_of_nodes)}",
+                          file=f)
+            metrics.report()
+    metrics.report(force=True)
 
-    del rep_ss
-    return final_ss
+    if show_progress:
+        print(f"\nFinished Analysing. Total '{len(representatives)}' "
+              f"SS-isomorphs found.")
+    return representatives
 
 
 def compress_steady_state(ss: str):
@@ -250,34 +322,70 @@ def compress_steady_state(ss: str):
 
 
 def full_analysis(no_of_nodes: int, no_of_edges: int, steady_states: list,
-                  chunks=20000, out_folder="out"):
+                  chunks=20000, out_folder="out",
+                  ignore_oscillations: bool = False,
+                  orderly: bool = False,
+                  metrics_file: str = None):
+    """
+    Generates networks with given steady states, removes isomorphic
+    networks and groups the rest by their state transition graphs
+    :param no_of_nodes: Number of nodes
+    :param no_of_edges: Number of edges
+    :param steady_states: List of target states
+    :param chunks: Chunk size used while searching isomorphs
+    :param out_folder: Folder for all output files
+    :param ignore_oscillations: Accept targets only as fixed points
+    :param orderly: Generate only one network per isomorphism class, which
+    makes separate isomorph search unnecessary
+    :param metrics_file: If given, counters, timers and rates of every
+    stage are written to this JSON file
+    """
+    # Snapshot of every stage is taken as soon as it finishes, so that
+    # rates are computed from its own running time
+    metrics = {}
     if not os.path.exists(out_folder):
         os.mkdir(out_folder)
     print("Generating all possible networks")
     ss_string = "_".join([compress_steady_state(x) for x in steady_states])
     filename = f"{out_folder}/net_n{no_of_nodes}e{no_of_edges}_{ss_string}.txt"
+    stage = Metrics([print_progress])
     generate_ss_networks(no_of_nodes, no_of_edges, steady_states,
                          interactions=[0, 1],
                          gates=[0, 1],
                          is_connected=True,
+                         ignore_oscillations=ignore_oscillations,
+                         non_isomorphic=orderly,
+                         metrics=stage,
                          filename=filename)
+    metrics["generate"] = stage.snapshot()
     print(f"\nAll networks stored in file: {filename}")
-    data = load_networks(filename)
-    iso_file = filename.replace("net", "iso")
-    print("Searching for Isomorphic Networks")
-    generate_iso_networks(data, chunks=chunks, filename=iso_file)
-    print(f"All isomorphs stored in file: {iso_file}")
-    del data
+    iso_file = filename
+    if not orderly:
+        iso_file = filename.replace("net", "iso")
+        print("Searching for Isomorphic Networks")
+        stage = Metrics([print_progress])
+        generate_iso_networks(iter_networks(filename), chunks=chunks,
+                              metrics=stage,
+                              filename=iso_file)
+        metrics["isomorphs"] = stage.snapshot()
+        print(f"All isomorphs stored in file: {iso_file}")
     print("Searching for SS-isomorphs")
-    iso_data = load_networks(iso_file)
     nc = NetworkCombinations(no_of_nodes, no_of_edges)
     nc.is_connected = True
     nc.interactions = [0, 1]
     nc.gates = [0, 1]
     ss_file = filename.replace("net", "ss_iso")
-    get_steady_state_isomorphs(iso_data, nc, chunks=10000, filename=ss_file)
+    stage = Metrics([print_progress])
+    get_steady_state_isomorphs(iter_networks(iso_file), nc, chunks=10000,
+                               metrics=stage,
+                               filename=ss_file)
+    metrics["ss_isomorphs"] = stage.snapshot()
     print("Analysis finished")
     print(f"SS-isomorphs saved in file : {ss_file}")
+    if metrics_file is not None:
+        with open(metrics_file, "w") as f:
+            json.dump(metrics, f, indent=2, sort_keys=True)
+        print(f"Metrics saved in file : {metrics_file}")
 
 
 def run():
@@ -0,0 +1,178 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Knockout and overexpression of nodes
+#
+#  Mutation is a tuple of (node, value) pairs, e.g. ((2, 0),) is knockout
+#  of node 2 and ((0, 1), (3, 0)) is overexpression of node 0 together with
+#  knockout of node 3. Clamped node keeps its value irrespective of its
+#  inputs, hence the mutant transition table is obtained directly from the
+#  wild type one as (T & ~clear) | set without evaluating the rules again.
+
+import itertools as itr
+
+import numpy as np
+
+from BooleanTRN.analysis.basins import batch_basins
+from BooleanTRN.helpers.common import iter_chunks
+from BooleanTRN.helpers.constants import *
+from BooleanTRN.models.transitions import (node_bit, state_to_code,
+                                           stack_node_masks,
+                                           batch_transition_table,
+                                           batch_cycle_states)
+
+KNOCKOUT = 0
+OVEREXPRESSION = 1
+
+
+def get_mutations(no_of_nodes: int, max_order: int = 2) -> list:
+    """
+    All single, double, ... mutants
+    :param no_of_nodes: Number of nodes
+    :param max_order: Maximum number of nodes clamped together
+    :return: List of mutations
+    """
+    mutations = []
+    for order in range(1, max_order + 1):
+        for nodes in itr.combinations(range(no_of_nodes), order):
+            for values in itr.product([KNOCKOUT, OVEREXPRESSION],
+                                      repeat=order):
+                mutations.append(tuple(zip(nodes, values)))
+    return mutations
+
+
+def mutation_masks(mutations: list, no_of_nodes: int) -> tuple:
+    """
+    :param mutations: List of mutations
+    :param no_of_nodes: Number of nodes
+    :return: Arrays of bits to be cleared and bits to be set for every
+    mutation
+    """
+    clear = np.zeros(len(mutations), dtype=np.int64)
+    fixed = np.zeros(len(mutations), dtype=np.int64)
+    for i, mutation in enumerate(mutations):
+        for node, value in mutation:
+            if value not in [KNOCKOUT, OVEREXPRESSION]:
+                raise ValueError(f"{value} is an invalid clamp value for "
+                                 f"node {node}. Available values are : "
+                                 f"{KNOCKOUT} and {OVEREXPRESSION}")
+            bit = node_bit(node, no_of_nodes)
+            clear[i] |= bit
+            if value == OVEREXPRESSION:
+                fixed[i] |= bit
+    return clear, fixed
+
+
+def clamp_transitions(transitions, mutations: list,
+                      no_of_nodes: int) -> np.ndarray:
+    """
+    Transition tables of all mutants in single vectorized pass
+    :param transitions: Wild type successor arrays of shape (K, 2^N) or
+    single array of length 2^N
+    :param mutations: List of mutations
+    :param no_of_nodes: Number of nodes
+    :return: int32 array of shape (K, len(mutations), 2^N) (or
+    (len(mutations), 2^N) for single wild type)
+    """
+    transitions = np.asarray(transitions, dtype=np.int64)
+    clear, fixed = mutation_masks(mutations, no_of_nodes)
+    clamped = (transitions[..., None, :] & ~clear[:, None]) | fixed[:, None]
+    return clamped.astype(np.int32)
+
+
+def _attractors(successors: list, labels) -> dict:
+    keys, sizes = np.unique(labels, return_counts=True)
+    attractors = {}
+    for key, size in zip(keys.tolist(), sizes.tolist()):
+        cycle = [key]
+        while successors[cycle[-1]] != key:
+            cycle.append(successors[cycle[-1]])
+        attractors[tuple(cycle)] = size / len(successors)
+    return attractors
+
+
+def perturbation_screen(transitions, no_of_nodes: int,
+                        mutations: list = None) -> dict:
+    """
+    Attractors and basins of all mutants compared with the wild type
+    :param transitions: Wild type successor array of length 2^N
+    :param no_of_nodes: Number of nodes
+    :param mutations: List of mutations (default: all single and double
+    mutants)
+    :return: Dictionary of mutation -> dictionary with "attractors"
+    (attractor -> fraction of the state space in its basin), "lost" and
+    "gained" attractors compared with the wild type and "shift" (total
+    variation distance between basin fractions of the wild type and
+    mutant). Wild type itself is stored under the empty tuple. Attractor
+    is the tuple of its states in the order of transitions, starting from
+    the smallest one.
+    """
+    if mutations is None:
+        mutations = get_mutations(no_of_nodes)
+    transitions = np.asarray(transitions, dtype=np.int32)
+    tables = np.concatenate([transitions[None, :],
+                             clamp_transitions(transitions, mutations,
+                                               no_of_nodes)])
+    labels, _, _ = batch_basins(tables)
+    report = {}
+    wild = None
+    for mutation, table, lb in zip([()] + list(mutations), tables, labels):
+        attractors = _attractors(table.tolist(), lb)
+        if wild is None:
+            wild = attractors
+        every = set(wild) | set(attractors)
+        report[mutation] = {
+            "attractors": attractors,
+            "lost": [x for x in wild if x not in attractors],
+            "gained": [x for x in attractors if x not in wild],
+            "shift": sum([abs(wild.get(x, 0) - attractors.get(x, 0))
+                          for x in every]) / 2
+        }
+    return report
+
+
+def filter_by_phenotypes(networks, no_of_nodes: int, phenotypes: dict, *,
+                         strict: bool = True,
+                         ignore_oscillations: bool = False,
+                         batch_size: int = 1000,
+                         default_gate: int = GATE_OR):
+    """
+    Keeps networks whose mutants have expected attractors. All mutants of
+    a batch of networks are screened together.
+    :param networks: Iterable of networks in the tuple format or packed
+    networks (e.g. `iter_networks(filename)`)
+    :param no_of_nodes: Number of nodes in each network
+    :param phenotypes: Dictionary of mutation -> list of state strings
+    which should be attractors of that mutant. Use empty tuple for the
+    wild type.
+    :param strict: If True, every state should be an attractor, otherwise
+    at least one
+    :param ignore_oscillations: Accept states only as fixed points
+    :param batch_size: Number of networks evaluated together
+    :param default_gate: Gate used when edge does not specify any gate
+    :return: Generator producing networks
+    """
+    mutations = list(phenotypes.keys())
+    codes = [np.asarray([state_to_code(x) for x in phenotypes[m]],
+                        dtype=np.int64) for m in mutations]
+    how = np.all
+    if not strict:
+        how = np.any
+    for batch in iter_chunks(networks, batch_size):
+        masks = stack_node_masks(batch, no_of_nodes, default_gate)
+        transitions = batch_transition_table(masks, no_of_nodes)
+        # Shape (K, M, 2^N), wild type is an empty mutation
+        mutants = clamp_transitions(transitions, mutations, no_of_nodes)
+        if not ignore_oscillations:
+            shape = mutants.shape
+            cyclic = batch_cycle_states(mutants.reshape(-1, shape[2]))
+            cyclic = cyclic.reshape(shape)
+        selected = np.ones(len(batch), dtype=bool)
+        for i in range(len(mutations)):
+            if ignore_oscillations:
+                found = mutants[:, i, codes[i]] == codes[i]
+            else:
+                found = cyclic[:, i, codes[i]]
+            selected &= how(found, axis=1)
+        yield from [n for n, s in zip(batch, selected) if s]
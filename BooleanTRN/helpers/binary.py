@@ -0,0 +1,164 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Compact binary network files
+#
+#  File starts with 16 byte header (magic, version, number of nodes, number
+#  of edges) followed by fixed width records. Every network is stored as
+#  `no_of_edges` rows of 4 unsigned bytes (source, destination, interaction,
+#  gate), in which `None` is stored as 255. Only first 4 positions of the
+#  tuple format are kept.
+
+import json
+import struct
+
+import numpy as np
+
+from BooleanTRN.helpers.common import iter_networks
+from BooleanTRN.models.packed import is_packed, unpack_network
+
+_MAGIC = b"BTRN"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHH6x")
+_NONE = 255
+_FIELDS = 4
+_WRITE_BATCH = 10000
+
+
+def _encode(network, no_of_edges: int) -> list:
+    if len(network) != no_of_edges:
+        raise ValueError(f"Network {network} does not have exactly "
+                         f"{no_of_edges} edges")
+    record = []
+    for edge in network:
+        # 255 is reserved for `None`, hence it is replaced only after the
+        # real values are checked
+        values = edge[:_FIELDS]
+        if any([x is not None and (x < 0 or x >= _NONE) for x in values]):
+            raise ValueError(f"Edge {edge} can not be stored in binary "
+                             f"format. Values should be between 0 and "
+                             f"{_NONE - 1}")
+        record.append([_NONE if x is None else x for x in values])
+    return record
+
+
+def _decode(record) -> list:
+    return [tuple([None if x == _NONE else x for x in row])
+            for row in record.tolist()]
+
+
+def write_binary_networks(networks, filename: str, no_of_nodes: int,
+                          no_of_edges: int) -> int:
+    """
+    Writes networks in the binary format
+    :param networks: Iterable of networks in the tuple format or packed
+    networks
+    :param filename: Output file
+    :param no_of_nodes: Number of nodes in each network
+    :param no_of_edges: Number of edges in each network
+    :return: Number of networks written
+    """
+    count = 0
+    with open(filename, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, no_of_nodes, no_of_edges))
+        batch = []
+        for n in networks:
+            if is_packed(n):
+                n = unpack_network(n, no_of_nodes)
+            batch.append(_encode(n, no_of_edges))
+            if len(batch) >= _WRITE_BATCH:
+                f.write(np.asarray(batch, dtype=np.uint8).tobytes())
+                count += len(batch)
+                batch = []
+        if len(batch) > 0:
+            f.write(np.asarray(batch, dtype=np.uint8).tobytes())
+            count += len(batch)
+    return count
+
+
+class BinaryNetworks:
+    """
+    Memory-mapped reader of the binary network file. Integer index gives
+    network in the tuple format while slices give new reader over the same
+    mapped memory (no copy). Raw records of shape (count, no_of_edges, 4)
+    are available as `records`.
+    """
+
+    def __init__(self, filename: str):
+        with open(filename, "rb") as f:
+            header = f.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError(f"{filename} is not a binary network file")
+        magic, version, nodes, edges = _HEADER.unpack(header)
+        if magic != _MAGIC:
+            raise ValueError(f"{filename} is not a binary network file")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported binary network file version "
+                             f"{version}")
+        self.filename = filename
+        self.no_of_nodes = nodes
+        self.no_of_edges = edges
+        shape = (0, edges, _FIELDS)
+        with open(filename, "rb") as f:
+            f.seek(0, 2)
+            size = f.tell() - _HEADER.size
+        if edges > 0 and size > 0:
+            shape = (size // (edges * _FIELDS), edges, _FIELDS)
+            self.records = np.memmap(filename, dtype=np.uint8, mode="r",
+                                     offset=_HEADER.size, shape=shape)
+        else:
+            self.records = np.zeros(shape, dtype=np.uint8)
+
+    def _view(self, records):
+        view = object.__new__(BinaryNetworks)
+        view.filename = self.filename
+        view.no_of_nodes = self.no_of_nodes
+        view.no_of_edges = self.no_of_edges
+        view.records = records
+        return view
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self._view(self.records[item])
+        return _decode(self.records[item])
+
+    def __iter__(self):
+        for record in self.records:
+            yield _decode(record)
+
+
+def text_to_binary(source: str, destination: str, no_of_nodes: int) -> int:
+    """
+    Converts network file in the text format (one JSON list per line) into
+    the binary format. Number of edges is taken from the first network.
+    :return: Number of networks converted
+    """
+    networks = iter_networks(source)
+    try:
+        first = next(networks)
+    except StopIteration:
+        return write_binary_networks([], destination, no_of_nodes, 0)
+
+    def _all():
+        yield first
+        yield from networks
+
+    return write_binary_networks(_all(), destination, no_of_nodes,
+                                 len(first))
+
+
+def binary_to_text(source: str, destination: str) -> int:
+    """
+    Converts binary network file back into the text format
+    :return: Number of networks converted
+    """
+    count = 0
+    with open(destination, "w") as f:
+        for n in BinaryNetworks(source):
+            print(json.dumps(n), file=f)
+            count += 1
+    return count
@@ -4,54 +4,164 @@
 #  This file is part of BooleanTRN project.
 #  Helper functions
 
+import itertools as itr
 import json
+from collections import defaultdict, deque
 
-import networkx as nx
+from BooleanTRN.helpers.instrumentation import Metrics, get_metrics
+from BooleanTRN.models.packed import is_packed, unpack_network
 
 
-def load_networks(filename) -> list:
-    data = []
+def iter_networks(filename):
+    """
+    Reads network file lazily, one network at a time
+    :param filename: Network file in the text format
+    :return: Generator producing networks
+    """
     with open(filename) as f:
         for line in f:
-            network = json.loads(line.strip())
-            data.append(network)
-    return data
+            if len(line.strip()) > 0:
+                yield json.loads(line.strip())
+
+
+def load_networks(filename) -> list:
+    return list(iter_networks(filename))
+
+
+def iter_chunks(networks, chunks: int):
+    """
+    Groups any iterable into lists of at most `chunks` items
+    """
+    tmp = []
+    for n in networks:
+        tmp.append(n)
+        if len(tmp) >= chunks:
+            yield tmp
+            tmp = []
+    if len(tmp) > 0:
+        yield tmp
+
+
+def imap_bounded(pool, func, iterable, max_pending: int):
+    """
+    Ordered `pool.imap` which never keeps more than `max_pending` items
+    submitted but not yet consumed. Unlike `pool.imap`, input is pulled
+    only when there is space, hence memory stays bounded for long inputs.
+    """
+    pending = deque()
+    for item in iterable:
+        pending.append(pool.apply_async(func, (item,)))
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+    while len(pending) > 0:
+        yield pending.popleft().get()
+
+
+def _sortable(value) -> int:
+    if value is None:
+        return -1
+    return value
+
+
+def refine_colours(nodes: list, edges: list, gates: dict) -> dict:
+    """
+    Colour refinement of nodes by their gates and colours of their signed
+    neighbours. Colours are named independent of the node labels.
+    :param nodes: List of nodes
+    :param edges: List of (source, destination, interaction)
+    :param gates: Dictionary of node -> gate
+    :return: Dictionary of node -> colour
+    """
+    incoming = defaultdict(list)
+    outgoing = defaultdict(list)
+    for start, end, interaction in edges:
+        incoming[end].append((interaction, start))
+        outgoing[start].append((interaction, end))
+
+    colours = {n: 0 for n in nodes}
+    count = 0
+    while True:
+        sig = {}
+        for n in nodes:
+            sig[n] = (colours[n], gates[n],
+                      tuple(sorted([(i, colours[x]) for i, x in incoming[n]])),
+                      tuple(sorted([(i, colours[x]) for i, x in outgoing[n]])))
+        names = {s: k for k, s in enumerate(sorted(set(sig.values())))}
+        colours = {n: names[sig[n]] for n in nodes}
+        if len(names) == count:
+            return colours
+        count = len(names)
+
+
+def canonical_form(network, no_of_nodes: int = None) -> tuple:
+    """
+    Canonical labelling of the network with respect to interaction types,
+    gates and self-loops. Two networks are isomorphic if and only if their
+    canonical forms are equal.
+
+    Nodes are first partitioned by colour refinement (which is independent
+    of the original labels) and the smallest edge encoding is then
+    searched only over the permutations which keep this partition.
+    :param network: Network in the tuple format or packed network
+    :param no_of_nodes: Number of nodes (needed only for packed network)
+    :return: Hashable tuple
+    """
+    if is_packed(network):
+        network = unpack_network(network, no_of_nodes)
+    nodes = set()
+    edges = []
+    gates = defaultdict(lambda: -1)
+    for edge in network:
+        nodes.add(edge[0])
+        if edge[1] is None:
+            continue
+        nodes.add(edge[1])
+        edges.append((edge[0], edge[1], _sortable(edge[2])))
+        gates[edge[1]] = _sortable(edge[3])
+    nodes = sorted(nodes)
+    gates = {n: gates[n] for n in nodes}
+
+    colours = refine_colours(nodes, edges, gates)
+    cells = defaultdict(list)
+    for n in nodes:
+        cells[colours[n]].append(n)
+    cells = [cells[k] for k in sorted(cells)]
+
+    best = None
+    for perm in itr.product(*[itr.permutations(x) for x in cells]):
+        position = {n: k for k, n in enumerate(y for x in perm for y in x)}
+        code = tuple(sorted([(position[a], position[b], i)
+                             for a, b, i in edges]))
+        if best is None or code < best:
+            best = code
+
+    labels = tuple([gates[n] for x in cells for n in x])
+    return labels, best
 
 
 def find_isomorphic_networks(networks: list,
-                             show_progress: bool = False) -> list:
-    def _node_condition(n1, n2):
-        try:
-            return n1["gate"] == n2["gate"]
-        except KeyError:
-            return True
-
-    def _edge_condition(e1, e2):
-        if len(e1.keys()) > 1 or len(e2.keys()) > 1:
-            print(e1, e2)
-        return e1[0]["interaction"] == e2[0]["interaction"]
-
-    isomorphs = []
+                             show_progress: bool = False,
+                             no_of_nodes: int = None,
+                             metrics: Metrics = None) -> list:
+    """
+    Keeps only first network from each isomorphism class
+    :param networks: Iterable of networks in the tuple format or packed
+    networks
+    :param show_progress: Print number of scanned networks
+    :param no_of_nodes: Number of nodes (needed only for packed networks)
+    :param metrics: `Metrics` which receives "scanned" and "isomorphs"
+    counters
+    :return: List of non-isomorphic networks
+    """
+    metrics = get_metrics(metrics, show_progress)
+    isomorphs = set()
     nets = []
-    ctr = 0
     for n in networks:
-        if show_progress:
-            print(f"\rScanned Combinations: {ctr}", end="")
-            ctr += 1
-        graph = nx.MultiDiGraph()
-        for edge in n:
-            graph.add_node(edge[1], gate=edge[3])
-            graph.add_edge(edge[0], edge[1], interaction=edge[2])
-
-        if len(isomorphs) == 0:
-            isomorphs.append(graph)
+        metrics.count("scanned")
+        key = canonical_form(n, no_of_nodes)
+        if key not in isomorphs:
+            isomorphs.add(key)
             nets.append(n)
-        else:
-            tmp = [nx.is_isomorphic(x, graph,
-                                    node_match=_node_condition,
-                                    edge_match=_edge_condition
-                                    ) for x in isomorphs]
-            if not any(tmp):
-                isomorphs.append(graph)
-                nets.append(n)
+            metrics.count("isomorphs")
+    metrics.report(force=True)
     return nets
@@ -0,0 +1,135 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Counters, stage timers and progress reporting
+#
+#  `Metrics` is deliberately process local. Workers create their own
+#  instance, send `snapshot()` back with their results and parent adds it
+#  with `merge()`. Hence nothing is shared between processes and there is
+#  no locking in the hot path.
+
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class Metrics:
+    """
+    Collects named counters and total time spent in named stages. Progress
+    callbacks are called with this object at most once per `interval`
+    seconds.
+    """
+
+    def __init__(self, callbacks: list = None, interval: float = 1.0):
+        self.counters = defaultdict(int)
+        self.timers = defaultdict(float)
+        self.callbacks = list(callbacks or [])
+        self.interval = interval
+        self._created = time.perf_counter()
+        self._last_report = self._created
+
+    def count(self, name: str, value: int = 1):
+        self.counters[name] += value
+        if self.callbacks:
+            self.report()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Adds time spent inside the `with` block to the timer of given stage
+        """
+        begin = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.timers[name] += time.perf_counter() - begin
+
+    def report(self, force: bool = False):
+        """
+        Calls progress callbacks, unless they were called less than
+        `interval` seconds ago
+        :param force: Call callbacks irrespective of the interval
+        """
+        now = time.perf_counter()
+        if not force and now - self._last_report < self.interval:
+            return
+        self._last_report = now
+        for func in self.callbacks:
+            func(self)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._created
+
+    def rates(self) -> dict:
+        """
+        :return: Dictionary of counter -> items per second of the wall time
+        """
+        elapsed = max(self.elapsed(), 1e-9)
+        return {k: v / elapsed for k, v in self.counters.items()}
+
+    def snapshot(self) -> dict:
+        """
+        :return: Picklable and JSON serializable copy of all metrics
+        """
+        return {
+            "elapsed": self.elapsed(),
+            "counters": dict(self.counters),
+            "timers": dict(self.timers),
+            "rates": self.rates()
+        }
+
+    def merge(self, snapshot: dict):
+        """
+        Adds counters and timers collected by other `Metrics` (usually in
+        worker process). Stage timers are summed, hence they give CPU time
+        of all workers together.
+        :param snapshot: Output of `Metrics.snapshot`
+        """
+        for k, v in snapshot["counters"].items():
+            self.counters[k] += v
+        for k, v in snapshot["timers"].items():
+            self.timers[k] += v
+
+    def save(self, filename: str):
+        """
+        Writes `snapshot()` as JSON
+        """
+        with open(filename, "w") as f:
+            json.dump(self.snapshot(), f, indent=2, sort_keys=True)
+
+
+class NullMetrics(Metrics):
+    """
+    Metrics which ignores counters, used when caller did not ask for any
+    instrumentation
+    """
+
+    def count(self, name: str, value: int = 1):
+        pass
+
+
+def print_progress(metrics: Metrics):
+    """
+    Progress callback which prints all counters and their rates on single
+    line
+    """
+    rates = metrics.rates()
+    text = ", ".join([f"{k}: {v} ({rates[k]:.0f}/s)"
+                      for k, v in sorted(metrics.counters.items())])
+    print(f"\r{text}", end="")
+
+
+def get_metrics(metrics: Metrics = None, show_progress: bool = False):
+    """
+    Metrics to be used by the function which accepts both `metrics` and
+    `show_progress` arguments
+    """
+    if metrics is not None:
+        if show_progress and print_progress not in metrics.callbacks:
+            metrics.callbacks.append(print_progress)
+        return metrics
+    if show_progress:
+        return Metrics([print_progress])
+    return NullMetrics()
@@ -0,0 +1,85 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Asynchronous update on sparse transition matrices
+#
+#  Under asynchronous update only one node is updated at a time, hence a
+#  state can have up to N successors, one for every node whose rule
+#  disagrees with its current value. Transition relation is stored as
+#  sparse 2^N x 2^N matrix without self-loops and attractors are its
+#  terminal strongly connected components (components without any edge
+#  leaving them).
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from BooleanTRN.models.transitions import node_bit, get_successors
+
+
+def async_transition_matrix(masks: tuple, no_of_nodes: int) -> csr_matrix:
+    """
+    Asynchronous transition relation built from single synchronous pass
+    :param masks: Output of `transitions.get_node_masks`
+    :param no_of_nodes: Number of nodes in the network
+    :return: Boolean CSR matrix of shape (2^N, 2^N) in which entry (s, t)
+    is True if state `t` follows state `s` after updating single node
+    """
+    size = 1 << no_of_nodes
+    states = np.arange(size, dtype=np.int64)
+    # Bits in which synchronous successor differs are exactly the nodes
+    # which change when updated alone
+    changed = states ^ get_successors(masks, states, no_of_nodes)
+    bits = np.asarray([node_bit(i, no_of_nodes) for i in range(no_of_nodes)],
+                      dtype=np.int64)
+    flips = (changed[None, :] & bits[:, None]) != 0
+    rows = np.broadcast_to(states, flips.shape)[flips]
+    columns = rows ^ np.broadcast_to(bits[:, None], flips.shape)[flips]
+    data = np.ones(len(rows), dtype=bool)
+    return csr_matrix((data, (rows, columns)), shape=(size, size))
+
+
+def find_async_attractors(matrix: csr_matrix) -> tuple:
+    """
+    Attractors as terminal strongly connected components of the
+    asynchronous transition relation
+    :param matrix: Output of `async_transition_matrix`
+    :return: list of fixed points and list of complex attractors (as
+    integer codes, each attractor sorted), ordered by their smallest state
+    """
+    count, labels = connected_components(matrix, directed=True,
+                                         connection="strong")
+    coo = matrix.tocoo()
+    leaving = labels[coo.row] != labels[coo.col]
+    terminal = np.ones(count, dtype=bool)
+    terminal[labels[coo.row[leaving]]] = False
+
+    states = np.flatnonzero(terminal[labels])
+    # Sorting by label keeps states of every component together
+    states = states[np.argsort(labels[states], kind="stable")]
+    groups = np.split(states, np.flatnonzero(np.diff(labels[states])) + 1)
+    groups = sorted([x.tolist() for x in groups if len(x) > 0])
+    fixed_points = [x[0] for x in groups if len(x) == 1]
+    attractors = [x for x in groups if len(x) > 1]
+    return fixed_points, attractors
+
+
+def async_basins(matrix: csr_matrix, attractors: list) -> np.ndarray:
+    """
+    States from which every attractor can be reached. Unlike synchronous
+    update, basins can overlap.
+    :param matrix: Output of `async_transition_matrix`
+    :param attractors: List of attractors (lists of integer codes)
+    :return: Boolean array of shape (len(attractors), 2^N)
+    """
+    basins = np.zeros((len(attractors), matrix.shape[0]), dtype=bool)
+    for i, attractor in enumerate(attractors):
+        frontier = np.zeros(matrix.shape[0], dtype=bool)
+        frontier[attractor] = True
+        while frontier.any():
+            basins[i] |= frontier
+            # Row `s` of the product is True if any successor of `s` is
+            # in the frontier, hence it gives all predecessors
+            frontier = (matrix @ frontier) & ~basins[i]
+    return basins
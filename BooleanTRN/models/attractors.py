@@ -0,0 +1,101 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Attractor detection on integer transition arrays
+#
+#  Under synchronous update every state has exactly one successor, hence the
+#  state transition graph is a functional graph and its attracting
+#  components are simply its cycles.
+
+import numpy as np
+
+from BooleanTRN.models.transitions import code_to_state
+
+_UNVISITED = 0
+_ON_PATH = 1
+_FINISHED = 2
+
+
+def find_attractors(transitions) -> tuple:
+    """
+    Finds all attractors in linear time by walking from every unvisited
+    state until the walk hits either its own path (new cycle) or an already
+    finished state.
+    :param transitions: Successor array of length 2^N
+    :return: list of fixed points and list of limit cycles (as integer
+    codes, each cycle in the order of its transitions)
+    """
+    successors = np.asarray(transitions).tolist()
+    colour = [_UNVISITED] * len(successors)
+    fixed_points = []
+    cycles = []
+    for start in range(len(successors)):
+        if colour[start] != _UNVISITED:
+            continue
+        path = []
+        node = start
+        while colour[node] == _UNVISITED:
+            colour[node] = _ON_PATH
+            path.append(node)
+            node = successors[node]
+        if colour[node] == _ON_PATH:
+            cycle = path[path.index(node):]
+            if len(cycle) == 1:
+                fixed_points.append(node)
+            else:
+                cycles.append(cycle)
+        for p in path:
+            colour[p] = _FINISHED
+    return fixed_points, cycles
+
+
+def attractors_to_states(fixed_points: list, cycles: list,
+                         no_of_nodes: int) -> tuple:
+    """
+    Converts integer attractors from `find_attractors` into state strings
+    """
+    ss = [code_to_state(x, no_of_nodes) for x in fixed_points]
+    oc = [[code_to_state(x, no_of_nodes) for x in c] for c in cycles]
+    return ss, oc
+
+
+def transition_signature(transitions) -> str:
+    """
+    Canonical signature of the state transition graph. Two transition
+    arrays have equal signatures if and only if their graphs are isomorphic.
+
+    Every state outside of attractors belongs to a tree rooted at some
+    state of an attractor. These trees are encoded with the AHU bracket
+    encoding (children sorted), every attractor becomes the smallest
+    rotation of the encodings of its states and the graph is the sorted
+    list of its attractors. Total work is linear in number of states up to
+    the length of the encodings.
+    :param transitions: Successor array of length 2^N
+    :return: Signature string
+    """
+    successors = np.asarray(transitions).tolist()
+    fixed_points, cycles = find_attractors(successors)
+    cycles = [[x] for x in fixed_points] + cycles
+    on_cycle = set([x for c in cycles for x in c])
+
+    children = [[] for _ in successors]
+    for state, future in enumerate(successors):
+        if state not in on_cycle:
+            children[future].append(state)
+
+    # Process trees from leaves towards attractors
+    order = list(on_cycle)
+    for state in order:
+        order.extend(children[state])
+    codes = [""] * len(successors)
+    for state in reversed(order):
+        codes[state] = "(" + "".join(
+            sorted([codes[x] for x in children[state]])) + ")"
+
+    encoded = []
+    for c in cycles:
+        seq = [codes[x] for x in c]
+        seq = min([seq[i:] + seq[:i] for i in range(len(seq))])
+        encoded.append("[" + "".join(seq) + "]")
+    return "".join(sorted(encoded))
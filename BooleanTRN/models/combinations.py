@@ -5,14 +5,88 @@
 
 
 import itertools as itr
+import math
 from collections import defaultdict
 
-import networkx as nx
+import numpy as np
 
 from BooleanTRN.helpers.constants import *
+from BooleanTRN.helpers.instrumentation import Metrics, get_metrics
+from BooleanTRN.models.asynchronous import async_transition_matrix
+from BooleanTRN.models.attractors import find_attractors
+from BooleanTRN.models.orderly import skeleton_automorphisms, relabel_network
+from BooleanTRN.models.packed import pack_network
+from BooleanTRN.models.symbolic import symbolic_attractors
+from BooleanTRN.models.transitions import (get_node_masks, transition_table,
+                                           to_state_dict,
+                                           state_to_code, get_node_rules,
+                                           next_state, node_bit,
+                                           IncrementalTransitions,
+                                           stack_node_masks,
+                                           batch_transition_table,
+                                           batch_cycle_states)
+
+
+def _unrank_combination(rank: int, n: int, k: int) -> list:
+    # k-combination of range(n) at given position in lexicographic order
+    comb = []
+    item = 0
+    for i in range(k):
+        while True:
+            count = math.comb(n - item - 1, k - i - 1)
+            if rank < count:
+                break
+            rank -= count
+            item += 1
+        comb.append(item)
+        item += 1
+    return comb
+
+
+def _next_combination(comb: list, n: int) -> list:
+    # Next k-combination of range(n) in lexicographic order
+    comb = list(comb)
+    k = len(comb)
+    for i in reversed(range(k)):
+        if comb[i] != i + n - k:
+            comb[i] += 1
+            for j in range(i + 1, k):
+                comb[j] = comb[j - 1] + 1
+            return comb
+    return None
+
+
+def _multiply(a: list, b: list, degree: int) -> list:
+    # Product of two polynomials (lists of coefficients) up to `degree`
+    tmp = [0] * (degree + 1)
+    for i, x in enumerate(a):
+        if x == 0:
+            continue
+        for j, y in enumerate(b[:degree + 1 - i]):
+            tmp[i + j] += x * y
+    return tmp
+
+
+def _gray_steps(radices: list):
+    # Reflected mixed-radix Gray code. Starting from all zeros, every step
+    # changes exactly one digit by one and yields (digit, new value)
+    digits = [0] * len(radices)
+    direction = [1] * len(radices)
+    while True:
+        for j in range(len(radices)):
+            value = digits[j] + direction[j]
+            if 0 <= value < radices[j]:
+                digits[j] = value
+                yield j, value
+                break
+            direction[j] = -direction[j]
+        else:
+            return
 
 
 class _NetEdge:
+    __slots__ = ("start", "end", "interaction")
+
     def __init__(self, start, end, interaction=None):
         self.start = start
         self.end = end
@@ -45,17 +119,98 @@ class NetworkCombinations:
         self.interactions = interactions
         self.gates = gates
         self._default_solving_gate = GATE_OR
+        # Above this number of nodes `find` does not enumerate state space,
+        # it follows trajectories of the targets and finds cycles only up
+        # to `cycle_length_limit` (same limit is the default of
+        # `get_symbolic_attractors`)
+        self.dense_node_limit = 16
+        self.cycle_length_limit = 4
+
+    def get_pair_count(self) -> int:
+        """
+        Number of possible edge sets (before interactions and gates are
+        assigned). Edge sets are ranked in the order of `itertools.combinations`
+        """
+        return math.comb(self.no_of_nodes * self.no_of_nodes,
+                         self.no_of_edges)
+
+    def count(self, connected: bool = None, gates: list = None,
+              interactions: list = None) -> int:
+        """
+        Number of networks produced by `get_combinations` computed without
+        enumerating them. Every node independently chooses its inputs,
+        hence networks on k nodes are counted by the k-th power of the
+        single node polynomial (coefficient of x^d counts ways to have d
+        inputs, including interactions and gate). Connected networks are
+        obtained by inclusion-exclusion over the component containing
+        the first node.
+        :param connected: Count only connected networks (default: same as
+        `is_connected`)
+        :param gates: Allowed gates (default: same as `gates`)
+        :param interactions: Allowed interactions (default: same as
+        `interactions`)
+        :return: Number of networks
+        """
+        if connected is None:
+            connected = self.is_connected
+        if gates is None:
+            gates = self.gates
+        if interactions is None:
+            interactions = self.interactions
+        edges = self.no_of_edges
 
-    def _get_pairs(self):
-        possible = itr.product(range(self.no_of_nodes),
-                               range(self.no_of_nodes))
-        comb = itr.combinations(possible, self.no_of_edges)
-        for c in comb:
-            tmp = [_NetEdge(*x) for x in c]
-            yield tuple(tmp)
+        def _all(k):
+            # All networks on k labelled nodes, by number of edges
+            node = [0] * (edges + 1)
+            for d in range(min(k, edges) + 1):
+                weight = math.comb(k, d) * pow(len(interactions), d)
+                if d > 1:
+                    weight *= len(gates)
+                node[d] = weight
+            tmp = [1] + [0] * edges
+            for _ in range(k):
+                tmp = _multiply(tmp, node, edges)
+            return tmp
+
+        if not connected:
+            return _all(self.no_of_nodes)[edges]
+
+        every = [_all(k) for k in range(self.no_of_nodes + 1)]
+        joined = [None]
+        for k in range(1, self.no_of_nodes + 1):
+            tmp = list(every[k])
+            for j in range(1, k):
+                part = _multiply(joined[j], every[k - j], edges)
+                for d in range(edges + 1):
+                    tmp[d] -= math.comb(k - 1, j - 1) * part[d]
+            joined.append(tmp)
+        total = joined[self.no_of_nodes][edges]
+        if self.no_of_nodes == 1 and edges == 0:
+            # Single node without any edge is not part of the network
+            total -= 1
+        return total
+
+    def _get_pairs(self, start: int = 0, stop: int = None):
+        possible = list(itr.product(range(self.no_of_nodes),
+                                    range(self.no_of_nodes)))
+        if start == 0 and stop is None:
+            comb = itr.combinations(possible, self.no_of_edges)
+            yield from comb
+            return
+
+        total = self.get_pair_count()
+        if stop is None or stop > total:
+            stop = total
+        if start >= stop:
+            return
+        comb = _unrank_combination(start, len(possible), self.no_of_edges)
+        for _ in range(stop - start):
+            yield tuple([possible[x] for x in comb])
+            comb = _next_combination(comb, len(possible))
 
     def _add_interactions(self, network):
         for n in network:
+            n = [_NetEdge(*x) for x in n]
             tmp = itr.repeat(self.interactions, len(n))
             for act in itr.product(*tmp):
                 for i in range(len(n)):
@@ -64,13 +219,29 @@ class NetworkCombinations:
                 yield tuple(tmp)
 
     def _is_connected(self, graph) -> bool:
-        quick = set([y for x in graph for y in x[:2]])
-        if len(quick) != self.no_of_nodes:
+        # Union-find in which every root keeps bitmask of its component.
+        # Graph is connected when some component covers all the nodes
+        if len(graph) == 0:
             return False
-        g = nx.Graph()
+        full = (1 << self.no_of_nodes) - 1
+        parent = list(range(self.no_of_nodes))
+        members = [1 << x for x in range(self.no_of_nodes)]
+
+        def _root(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
         for n in graph:
-            g.add_edge(n[0], n[1])
-        return nx.is_connected(g) and len(g.nodes) == self.no_of_nodes
+            a = _root(n[0])
+            b = _root(n[1])
+            if a != b:
+                parent[a] = b
+                members[b] |= members[a]
+                if members[b] == full:
+                    return True
+        return members[_root(graph[0][0])] == full
 
     def _add_gate(self, network):
         source = defaultdict(list)
@@ -86,93 +257,432 @@ class NetworkCombinations:
                     tmp.append((*n, None))
             yield tmp
 
-    def get_combinations(self):
+    def _packed_networks(self, pairs):
+        # Same networks and order as `_add_interactions` and `_add_gate`,
+        # but bit fields of `models.packed` are assembled directly from
+        # the edge set without building any tuple
+        n = self.no_of_nodes
+        bits = [1 << (x[0] * n + x[1]) for x in pairs]
+        adjacency = sum(bits) << (n * n + n)
+        for x in self.interactions:
+            if x not in [INTERACTION_POSITIVE, INTERACTION_NEGATIVE]:
+                raise ValueError(f"{x} is an invalid interaction code. "
+                                 f"Available codes are : "
+                                 f"{INTERACTION_POSITIVE} and "
+                                 f"{INTERACTION_NEGATIVE}")
+        signs = []
+        for act in itr.product(self.interactions, repeat=len(pairs)):
+            code = 0
+            for bit, x in zip(bits, act):
+                if x == INTERACTION_POSITIVE:
+                    code |= bit
+            signs.append(code << n)
+        in_degree = defaultdict(int)
+        for x in pairs:
+            in_degree[x[1]] += 1
+        gated = [x for x in in_degree if in_degree[x] > 1]
+        gates = []
+        for g in itr.product(self.gates, repeat=len(gated)):
+            code = 0
+            for node, x in zip(gated, g):
+                if x == GATE_AND:
+                    code |= 1 << node
+            gates.append(code)
+        for x in signs:
+            for g in gates:
+                yield adjacency | x | g
+
+    def get_combinations(self, start: int = 0, stop: int = None,
+                         packed: bool = False):
         """
         All possible combinations for given settings
+        :param start: Rank of the first edge set to be used
+        :param stop: Rank after the last edge set to be used
+        :param packed: Produce bit-packed integers instead of tuples
         :return: Generator Producing Network
         """
-        n = self._get_pairs()
-        n = self._add_interactions(n)
-        for m in n:
+        for pairs in self._get_pairs(start, stop):
+            # Connectivity depends only on the edge set, hence it is
+            # checked once before interactions and gates are assigned
             if self.is_connected:
-                if not self._is_connected(m):
+                if not self._is_connected(pairs):
                     continue
-            for k in self._add_gate(m):
-                yield k
+            if packed:
+                yield from self._packed_networks(pairs)
+                continue
+            for m in self._add_interactions([pairs]):
+                yield from self._add_gate(m)
 
-    @staticmethod
-    def _input_network(network):
-        tmp = defaultdict(list)
-        for n in network:
-            tmp[n[1]].append((n[0], n[2], n[3]))
-        return dict(tmp)
-
-    def _solve(self, input_net, init) -> tuple:
-        tmp = []
-        for i in range(self.no_of_nodes):
-            if i not in input_net.keys():
-                tmp.append(init[i])
-            else:
-                gate = list(set([x[2] for x in input_net[i]]))
-                if len(gate) != 1:
-                    raise AttributeError(
-                        "Gate assignment error. Please check Gate "
-                        "implementation.")
-                gate = gate[0] or self._default_solving_gate
-                truth = []
-                for t in input_net[i]:
-                    if t[1] == INTERACTION_POSITIVE:
-                        truth.append(init[0])
-                    elif t[1] == INTERACTION_NEGATIVE:
-                        truth.append(not init[0])
+    def _node_options(self, node: int, codes: list) -> dict:
+        bit = node_bit(node, self.no_of_nodes)
+        options = defaultdict(list)
+        for d in range(min(self.no_of_nodes, self.no_of_edges) + 1):
+            gates = [None]
+            if d > 1:
+                gates = self.gates
+            for sources in itr.combinations(range(self.no_of_nodes), d):
+                for signs in itr.product(self.interactions, repeat=d):
+                    for g in gates:
+                        edges = [(s, node, i, g)
+                                 for s, i in zip(sources, signs)]
+                        rules = get_node_rules(edges, self.no_of_nodes,
+                                               self._default_solving_gate)
+                        # Rule of this node should keep its value in every
+                        # target, otherwise no completion can be valid
+                        if all([next_state(rules, c, self.no_of_nodes) & bit
+                                == c & bit for c in codes]):
+                            options[d].append(edges)
+        return dict(options)
+
+    def get_ss_combinations(self, target: list):
+        """
+        Networks in which every target state is a fixed point. Nodes are
+        assigned their incoming edges, interactions and gate one by one
+        and partial networks are pruned as soon as any node's rule
+        contradicts one of the targets.
+        :param target: List of state strings (e.g. "10110")
+        :return: Generator Producing Network
+        """
+        codes = [state_to_code(x) for x in target]
+        options = [self._node_options(v, codes)
+                   for v in range(self.no_of_nodes)]
+
+        # Total in-degrees which can still be realised by remaining nodes
+        reachable = [{0} for _ in range(self.no_of_nodes + 1)]
+        for v in reversed(range(self.no_of_nodes)):
+            reachable[v] = set([d + r for d in options[v]
+                                for r in reachable[v + 1]
+                                if d + r <= self.no_of_edges])
+
+        def _assign(node, remaining, edges):
+            if node == self.no_of_nodes:
+                yield edges
+                return
+            for d, opts in options[node].items():
+                if remaining - d not in reachable[node + 1]:
+                    continue
+                for o in opts:
+                    yield from _assign(node + 1, remaining - d, edges + o)
+
+        for network in _assign(0, self.no_of_edges, []):
+            network = sorted(network, key=lambda x: x[:2])
+            if self.is_connected:
+                if not self._is_connected(network):
+                    continue
+            yield network
+
+    def get_non_isomorphic(self, start: int = 0, stop: int = None,
+                           with_orbit_size: bool = False):
+        """
+        Orderly generation of exactly one network from every isomorphism
+        class (node relabelling which keeps interactions and gates).
+        Non-canonical edge sets are rejected before interactions and gates
+        are assigned.
+        :param start: Rank of the first edge set to be used
+        :param stop: Rank after the last edge set to be used
+        :param with_orbit_size: Also produce number of labelled networks
+        in the isomorphism class
+        :return: Generator producing network or (network, orbit size)
+        """
+        labellings = math.factorial(self.no_of_nodes)
+        for pairs in self._get_pairs(start, stop):
+            if self.is_connected:
+                if not self._is_connected(pairs):
+                    continue
+            automorphisms = skeleton_automorphisms(pairs, self.no_of_nodes)
+            if automorphisms is None:
+                continue
+            for m in self._add_interactions([pairs]):
+                for k in self._add_gate(m):
+                    own = pack_network(k, self.no_of_nodes)
+                    stabilizer = 0
+                    for perm in automorphisms:
+                        code = pack_network(relabel_network(k, perm),
+                                            self.no_of_nodes)
+                        if code < own:
+                            break
+                        if code == own:
+                            stabilizer += 1
+                    else:
+                        if with_orbit_size:
+                            yield k, labellings // stabilizer
+                        else:
+                            yield k
+
+    def get_incremental(self, start: int = 0, stop: int = None):
+        """
+        Same networks as `get_combinations` together with their transition
+        tables. For every edge set interactions and gates are visited in
+        Gray code order, hence consecutive networks differ in single
+        interaction or gate and only one node has to be re-evaluated.
+        :param start: Rank of the first edge set to be used
+        :param stop: Rank after the last edge set to be used
+        :return: Generator producing (network, transition table). Table is
+        updated in-place, copy it if it should be kept.
+        """
+        engine = IncrementalTransitions(self.no_of_nodes)
+        for pairs in self._get_pairs(start, stop):
+            if self.is_connected:
+                if not self._is_connected(pairs):
+                    continue
+            inputs = defaultdict(list)
+            for k, (_, end) in enumerate(pairs):
+                inputs[end].append(k)
+            gated = [x for x in inputs if len(inputs[x]) > 1]
+            signs = [0] * len(pairs)
+            gates = {x: 0 for x in gated}
+
+            def _update(node):
+                pos = 0
+                neg = 0
+                for k in inputs[node]:
+                    bit = node_bit(pairs[k][0], self.no_of_nodes)
+                    if self.interactions[signs[k]] == INTERACTION_POSITIVE:
+                        pos |= bit
                     else:
-                        raise AttributeError(
-                            f"{t[i]} is an invalid interaction "
-                            f"code. Available codes are : "
-                            f"{INTERACTION_POSITIVE} and "
-                            f"{INTERACTION_NEGATIVE}")
-                if gate == GATE_OR:
-                    tmp.append(int(any(truth)))
-                elif gate == GATE_AND:
-                    tmp.append(int(all(truth)))
+                        neg |= bit
+                gate = self._default_solving_gate
+                if node in gates:
+                    gate = self.gates[gates[node]] or gate
+                engine.set_node(node, pos, neg, gate)
+
+            def _network():
+                tmp = []
+                for k, (begin, end) in enumerate(pairs):
+                    gate = None
+                    if end in gates:
+                        gate = self.gates[gates[end]]
+                    tmp.append((begin, end, self.interactions[signs[k]],
+                                gate))
+                return tmp
+
+            engine.reset()
+            for node in inputs:
+                _update(node)
+            yield _network(), engine.table
+
+            radices = [len(self.interactions)] * len(pairs)
+            radices += [len(self.gates)] * len(gated)
+            for digit, value in _gray_steps(radices):
+                if digit < len(pairs):
+                    signs[digit] = value
+                    _update(pairs[digit][1])
                 else:
-                    raise AttributeError(f"{gate} is an invalid Gate code. "
-                                         f"Available codes are: {GATE_OR}, "
-                                         f"{GATE_AND}")
+                    node = gated[digit - len(pairs)]
+                    gates[node] = value
+                    _update(node)
+                yield _network(), engine.table
 
-        return tuple(tmp)
+    def get_transitions(self, network: list):
+        """
+        Successors of all 2^N states computed in single vectorized pass
+        :param network: Network in the tuple format
+        :return: int32 array in which index is the integer code of the state
+        and value is the code of its successor
+        """
+        masks = get_node_masks(network, self.no_of_nodes,
+                               self._default_solving_gate)
+        return transition_table(masks, self.no_of_nodes)
 
     def get_state_space(self, network: list) -> dict:
-        net = self._input_network(network)
-        tmp = itr.repeat([1, 0], self.no_of_nodes)
-        state = {}
-        for init in itr.product(*tmp):
-            future = self._solve(net, init)
-            future = [f"{int(x)}" for x in future]
-            init = [f"{int(x)}" for x in init]
-            state["".join(init)] = "".join(future)
-        return state
+        return to_state_dict(self.get_transitions(network), self.no_of_nodes)
+
+    def get_symbolic_attractors(self, network: list,
+                                max_cycle_length: int = None) -> tuple:
+        """
+        Attractors found with binary decision diagrams, without building
+        the state space (see `symbolic.symbolic_attractors`)
+        :param network: Network in the tuple format
+        :param max_cycle_length: Longest limit cycle to be searched
+        (default: `cycle_length_limit`)
+        :return: list of fixed points and list of limit cycles
+        """
+        if max_cycle_length is None:
+            max_cycle_length = self.cycle_length_limit
+        return symbolic_attractors(network, self.no_of_nodes,
+                                   max_cycle_length,
+                                   self._default_solving_gate)
+
+    def get_async_transitions(self, network: list):
+        """
+        Transition relation under asynchronous (one node at a time) update
+        :param network: Network in the tuple format
+        :return: Boolean CSR matrix of shape (2^N, 2^N) (see
+        `asynchronous.find_async_attractors` for its attractors)
+        """
+        masks = get_node_masks(network, self.no_of_nodes,
+                               self._default_solving_gate)
+        return async_transition_matrix(masks, self.no_of_nodes)
 
     @staticmethod
     def find_attracting_components(network: dict) -> tuple:
-        graph = nx.DiGraph()
-        for key, value in network.items():
-            graph.add_edge(key, value)
-        ss = []
-        oc = []
-        for n in nx.attracting_components(graph):
-            if len(n) == 1:
-                ss.append(list(n)[0])
+        """
+        Attractors of any transition dictionary (complete state space or
+        only part of it, labels need not be state strings). States are
+        renumbered densely, state which has no successor in the
+        dictionary is treated as a fixed point.
+        :param network: Dictionary of state -> next state
+        :return: list of fixed points and list of limit cycles (as labels
+        used in the dictionary)
+        """
+        labels = list(network)
+        index = {x: k for k, x in enumerate(labels)}
+        for value in network.values():
+            if value not in index:
+                index[value] = len(labels)
+                labels.append(value)
+        successors = [index[network[x]] if x in network else k
+                      for k, x in enumerate(labels)]
+        fixed, cycles = find_attractors(successors)
+        return [labels[x] for x in fixed], [[labels[x] for x in c]
+                                            for c in cycles]
+
+    def _has_fixed_points(self, network, codes: list, strict: bool) -> bool:
+        rules = get_node_rules(network, self.no_of_nodes,
+                               self._default_solving_gate)
+        for code in codes:
+            fixed = next_state(rules, code, self.no_of_nodes) == code
+            if strict and not fixed:
+                return False
+            if not strict and fixed:
+                return True
+        return strict
+
+    def _has_short_attractors(self, network, codes: list, strict: bool,
+                              ignore_steady_states: bool) -> bool:
+        # Same decision as `_matches`, but every target is only followed
+        # for `cycle_length_limit` steps to find its period
+        rules = get_node_rules(network, self.no_of_nodes,
+                               self._default_solving_gate)
+        periods = []
+        for code in codes:
+            period = 0
+            state = code
+            for step in range(1, self.cycle_length_limit + 1):
+                state = next_state(rules, state, self.no_of_nodes)
+                if state == code:
+                    period = step
+                    break
+            periods.append(period)
+        how = all
+        if not strict:
+            how = any
+        if not ignore_steady_states:
+            if how([x == 1 for x in periods]):
+                return True
+        return how([x > 1 for x in periods])
+
+    @staticmethod
+    def _matches(ss: list, oc: list, codes: list, strict: bool,
+                 ignore_oscillations: bool,
+                 ignore_steady_states: bool) -> bool:
+        ss = set(ss)
+        all_oc = set([y for x in oc for y in x])
+        how = all
+        if not strict:
+            how = any
+        if not ignore_steady_states:
+            if how([x in ss for x in codes]):
+                return True
+        if not ignore_oscillations:
+            if how([x in all_oc for x in codes]):
+                return True
+        return False
+
+    def _find_non_isomorphic(self, target: list, strict: bool,
+                             ignore_oscillations: bool, metrics: Metrics,
+                             ignore_steady_states: bool, start: int,
+                             stop: int, packed: bool):
+        perms = list(itr.permutations(range(self.no_of_nodes)))
+        for n in self.get_non_isomorphic(start, stop):
+            metrics.count("scanned")
+            found = None
+            if target is None:
+                found = n
             else:
-                oc.append(list(n))
-        del graph
-        return ss, oc
+                # Representative may have targets only up to relabelling,
+                # hence every labelling is checked against attractors which
+                # are computed once
+                ss, oc = find_attractors(self.get_transitions(n))
+                for perm in perms:
+                    codes = [state_to_code("".join(
+                        [t.strip()[perm[v]] for v in range(self.no_of_nodes)]))
+                        for t in target]
+                    if self._matches(ss, oc, codes, strict,
+                                     ignore_oscillations,
+                                     ignore_steady_states):
+                        found = relabel_network(n, perm)
+                        break
+            if found is not None:
+                metrics.count("found")
+                if packed:
+                    yield pack_network(found, self.no_of_nodes)
+                else:
+                    yield found
+
+    def _screen_batch(self, networks: list, target: list, strict: bool,
+                      ignore_oscillations: bool,
+                      ignore_steady_states: bool) -> list:
+        codes = [state_to_code(x) for x in target]
+        if ignore_oscillations:
+            # Only fixed points can qualify. Successors of the targets are
+            # cheaper than stacking the masks of whole batch.
+            if ignore_steady_states:
+                return []
+            return [n for n in networks
+                    if self._has_fixed_points(n, codes, strict)]
+        masks = stack_node_masks(networks, self.no_of_nodes,
+                                 self._default_solving_gate)
+        codes = np.asarray(codes, dtype=np.int32)
+        how = np.all
+        if not strict:
+            how = np.any
+        transitions = batch_transition_table(masks, self.no_of_nodes)
+        fixed = transitions[:, codes] == codes
+        selected = np.zeros(len(networks), dtype=bool)
+        if not ignore_steady_states:
+            selected |= how(fixed, axis=1)
+        cyclic = batch_cycle_states(transitions)
+        selected |= how(cyclic[:, codes] & ~fixed, axis=1)
+        return [n for n, s in zip(networks, selected) if s]
 
     def find(self, target: list = None,
              strict: bool = True,
              ignore_oscillations: bool = False,
              show_progress: bool = False,
-             ignore_steady_states: bool = False):
+             ignore_steady_states: bool = False,
+             batch_size: int = None,
+             start: int = 0,
+             stop: int = None,
+             packed: bool = False,
+             non_isomorphic: bool = False,
+             incremental: bool = False,
+             metrics: Metrics = None):
+        """
+        Finds networks which have given target states as their attractors.
+        For networks with more than `dense_node_limit` nodes the state
+        space is not built, trajectory of every target is followed instead
+        and limit cycles longer than `cycle_length_limit` are not found.
+        Binary decision diagrams are not used here, they are available
+        through `get_symbolic_attractors`.
+        :param target: List of state strings (e.g. "10110")
+        :param strict: If True, every target should be an attractor
+        :param ignore_oscillations: Ignore targets found in limit cycles
+        :param show_progress: Print number of scanned combinations
+        :param ignore_steady_states: Ignore targets found as fixed points
+        :param batch_size: If given, candidates are evaluated together in
+        batches of this size
+        :param start: Rank of the first edge set to be scanned
+        :param stop: Rank after the last edge set to be scanned
+        :param packed: Produce bit-packed integers instead of tuples
+        :param non_isomorphic: Produce only one network from every
+        isomorphism class (see `get_non_isomorphic`)
+        :param incremental: Re-evaluate only changed node between
+        consecutive candidates (see `get_incremental`)
+        :param metrics: `Metrics` which receives "scanned" and "found"
+        counters and time of the "find" stage
+        :return: Generator producing networks
+        """
         if target is not None:
             for t in target:
                 if len(t.strip()) != self.no_of_nodes:
@@ -183,26 +693,121 @@ class NetworkCombinations:
                     raise ValueError(f"Invalid target '{t}'. Every character "
                                      f"of the target should be either 1 or 0.")
 
-        nets = self.get_combinations()
-        c = 0
+        metrics = get_metrics(metrics, show_progress)
+        found = self._find(target, strict, ignore_oscillations,
+                           ignore_steady_states, batch_size, start, stop,
+                           packed, non_isomorphic, incremental, metrics)
+        while True:
+            # Only time spent in producing networks is counted, not the
+            # time spent by the consumer
+            with metrics.stage("find"):
+                n = next(found, None)
+            if n is None:
+                break
+            yield n
+        metrics.report(force=True)
+
+    def _find(self, target: list, strict: bool, ignore_oscillations: bool,
+              ignore_steady_states: bool, batch_size: int, start: int,
+              stop: int, packed: bool, non_isomorphic: bool,
+              incremental: bool, metrics: Metrics):
+        if non_isomorphic:
+            yield from self._find_non_isomorphic(target, strict,
+                                                 ignore_oscillations,
+                                                 metrics,
+                                                 ignore_steady_states,
+                                                 start, stop, packed)
+            return
+
+        full_range = start == 0 and stop is None
+        if target is not None and strict and ignore_oscillations and \
+                full_range:
+            # Every target has to be a fixed point, which is enforced while
+            # networks are being built. This does not follow edge set ranks,
+            # hence it is used only when whole range is requested
+            if ignore_steady_states:
+                return
+            for n in self.get_ss_combinations(target):
+                metrics.count("scanned")
+                metrics.count("found")
+                if packed:
+                    yield pack_network(n, self.no_of_nodes)
+                else:
+                    yield n
+            return
+
+        if target is not None and self.no_of_nodes > self.dense_node_limit:
+            # State space is too large to be enumerated for every
+            # candidate, hence only trajectories of the targets are
+            # followed. Batches and incremental tables are not used.
+            codes = [state_to_code(x) for x in target]
+            for n in self.get_combinations(start, stop, packed):
+                metrics.count("scanned")
+                if ignore_oscillations:
+                    selected = not ignore_steady_states and \
+                        self._has_fixed_points(n, codes, strict)
+                else:
+                    selected = self._has_short_attractors(
+                        n, codes, strict, ignore_steady_states)
+                if selected:
+                    metrics.count("found")
+                    yield n
+            return
+
+        if target is not None and incremental and batch_size is None:
+            codes = [state_to_code(x) for x in target]
+            how = all if strict else any
+            for n, transitions in self.get_incremental(start, stop):
+                metrics.count("scanned")
+                if ignore_oscillations:
+                    # Only fixed points can qualify, attractors of the
+                    # whole table are not needed
+                    selected = not ignore_steady_states and how(
+                        [transitions[x] == x for x in codes])
+                else:
+                    ss, oc = find_attractors(transitions)
+                    selected = self._matches(ss, oc, codes, strict,
+                                             ignore_oscillations,
+                                             ignore_steady_states)
+                if selected:
+                    metrics.count("found")
+                    if packed:
+                        yield pack_network(n, self.no_of_nodes)
+                    else:
+                        yield n
+            return
+
+        nets = self.get_combinations(start, stop, packed)
+        if target is not None and batch_size is not None:
+            while True:
+                batch = list(itr.islice(nets, batch_size))
+                if len(batch) == 0:
+                    break
+                metrics.count("scanned", len(batch))
+                selected = self._screen_batch(batch, target, strict,
+                                              ignore_oscillations,
+                                              ignore_steady_states)
+                metrics.count("found", len(selected))
+                yield from selected
+            return
+
+        codes = []
+        if target is not None:
+            codes = [state_to_code(x) for x in target]
         for n in nets:
-            if show_progress:
-                print(f"\rScanned Combinations: {c}", end="")
-                c += 1
+            metrics.count("scanned")
             if target is None:
-                yield n
+                selected = True
+            elif ignore_oscillations:
+                # Target can only be a fixed point, which can be checked
+                # without building the full state space
+                selected = not ignore_steady_states and \
+                    self._has_fixed_points(n, codes, strict)
             else:
-                state = self.get_state_space(n)
-                ss, oc = self.find_attracting_components(state)
-                all_oc = [y for x in oc for y in x]
-                how = all
-                if not strict:
-                    how = any
-                if not ignore_steady_states:
-                    if how([x in ss for x in target]):
-                        yield n
-                        continue
-                if not ignore_oscillations:
-                    if how([x in all_oc for x in target]):
-                        yield n
-                        continue
+                ss, oc = find_attractors(self.get_transitions(n))
+                selected = self._matches(ss, oc, codes, strict,
+                                         ignore_oscillations,
+                                         ignore_steady_states)
+            if selected:
+                metrics.count("found")
+                yield n
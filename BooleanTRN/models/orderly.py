@@ -0,0 +1,66 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Orderly generation of non-isomorphic networks
+#
+#  Canonical representative of an isomorphism class is the labelling with
+#  the smallest packed code (see `models.packed`) among the permutations
+#  which keep colour refinement order of the unsigned skeleton. Adjacency is
+#  the most significant field of the packed code, hence the skeleton of
+#  every representative is itself minimal. This allows rejecting
+#  non-canonical skeletons before any interaction or gate is assigned, and
+#  only automorphisms of the skeleton have to be checked for the decorated
+#  networks.
+
+import itertools as itr
+
+from BooleanTRN.helpers.common import refine_colours
+
+
+def relabel_network(network, perm) -> list:
+    """
+    Relabels nodes of the network
+    :param network: Network in the tuple format
+    :param perm: Sequence in which `perm[old_label]` is the new label
+    :return: Relabelled network with edges sorted by source and destination
+    """
+    tmp = [(perm[x[0]], perm[x[1]], *x[2:]) for x in network]
+    return sorted(tmp, key=lambda x: x[:2])
+
+
+def _skeleton_code(pairs, perm, no_of_nodes: int) -> int:
+    code = 0
+    for start, end in pairs:
+        code |= 1 << (perm[start] * no_of_nodes + perm[end])
+    return code
+
+
+def skeleton_automorphisms(pairs, no_of_nodes: int):
+    """
+    Checks if the edge set is canonical
+    :param pairs: List of (source, destination) pairs
+    :param no_of_nodes: Number of nodes
+    :return: List of automorphisms of the skeleton (as in `relabel_network`)
+    if skeleton is canonical, otherwise None
+    """
+    nodes = list(range(no_of_nodes))
+    edges = [(x[0], x[1], 0) for x in pairs]
+    colours = refine_colours(nodes, edges, {n: -1 for n in nodes})
+    # Canonical labelling always lists colour classes in order
+    if any([colours[v] > colours[v + 1] for v in range(no_of_nodes - 1)]):
+        return None
+    blocks = [list(g) for _, g in itr.groupby(nodes, key=colours.get)]
+
+    own = _skeleton_code(pairs, nodes, no_of_nodes)
+    automorphisms = []
+    for order in itr.product(*[itr.permutations(b) for b in blocks]):
+        perm = [0] * no_of_nodes
+        for k, n in enumerate(y for x in order for y in x):
+            perm[n] = k
+        code = _skeleton_code(pairs, perm, no_of_nodes)
+        if code < own:
+            return None
+        if code == own:
+            automorphisms.append(perm)
+    return automorphisms
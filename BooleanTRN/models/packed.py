@@ -0,0 +1,109 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Bit-packed integer representation of networks
+#
+#  Network with N nodes is stored as single Python integer with three
+#  fields (from least significant bit):
+#       gates        : N bits, bit `i` is 1 if node `i` uses AND gate
+#       interactions : N*N bits, bit `src * N + dst` is 1 if edge is positive
+#       adjacency    : N*N bits, bit `src * N + dst` is 1 if edge exists
+#  Hence packed networks are hashable, cheap to compare and sort first by
+#  their wiring. Gate of a node with less than 2 inputs is not stored and it
+#  is restored as `None` (same as networks from `NetworkCombinations`).
+
+from BooleanTRN.helpers.constants import *
+
+
+def pack_network(network, no_of_nodes: int) -> int:
+    """
+    Packs network from the tuple format into single integer
+    :param network: Network in the tuple format
+    :param no_of_nodes: Number of nodes in the network
+    :return: Packed network
+    """
+    squared = no_of_nodes * no_of_nodes
+    adjacency = 0
+    interactions = 0
+    gates = 0
+    for edge in network:
+        if edge[1] is None:
+            continue
+        bit = 1 << (edge[0] * no_of_nodes + edge[1])
+        if adjacency & bit:
+            raise ValueError(f"Multiple edges between {edge[0]} and "
+                             f"{edge[1]} can not be packed")
+        adjacency |= bit
+        if edge[2] == INTERACTION_POSITIVE:
+            interactions |= bit
+        elif edge[2] != INTERACTION_NEGATIVE:
+            raise ValueError(f"{edge[2]} is an invalid interaction code. "
+                             f"Available codes are : "
+                             f"{INTERACTION_POSITIVE} and "
+                             f"{INTERACTION_NEGATIVE}")
+        if edge[3] == GATE_AND:
+            gates |= 1 << edge[1]
+    return (((adjacency << squared) | interactions) << no_of_nodes) | gates
+
+
+def unpack_network(code: int, no_of_nodes: int) -> list:
+    """
+    Converts packed network back to the tuple format
+    :param code: Packed network
+    :param no_of_nodes: Number of nodes in the network
+    :return: Network in the tuple format (edges sorted by source and
+    destination)
+    """
+    squared = no_of_nodes * no_of_nodes
+    gates = code & ((1 << no_of_nodes) - 1)
+    interactions = (code >> no_of_nodes) & ((1 << squared) - 1)
+    adjacency = code >> (no_of_nodes + squared)
+    edges = []
+    in_degree = [0] * no_of_nodes
+    for k in range(squared):
+        if adjacency >> k & 1:
+            edges.append((k // no_of_nodes, k % no_of_nodes))
+            in_degree[k % no_of_nodes] += 1
+    network = []
+    for start, end in edges:
+        interaction = INTERACTION_NEGATIVE
+        if interactions >> (start * no_of_nodes + end) & 1:
+            interaction = INTERACTION_POSITIVE
+        gate = None
+        if in_degree[end] > 1:
+            gate = GATE_AND if gates >> end & 1 else GATE_OR
+        network.append((start, end, interaction, gate))
+    return network
+
+
+def is_packed(network) -> bool:
+    return isinstance(network, int)
+
+
+def packed_rules(code: int, no_of_nodes: int) -> dict:
+    """
+    Update rules (same as `transitions.get_node_rules`) read directly from
+    the packed network without converting it to tuples
+    """
+    squared = no_of_nodes * no_of_nodes
+    gates = code & ((1 << no_of_nodes) - 1)
+    interactions = (code >> no_of_nodes) & ((1 << squared) - 1)
+    adjacency = code >> (no_of_nodes + squared)
+    rules = {}
+    for end in range(no_of_nodes):
+        pos = 0
+        neg = 0
+        for start in range(no_of_nodes):
+            k = start * no_of_nodes + end
+            if adjacency >> k & 1:
+                # State of node `start` is stored in bit (N - 1 - start)
+                bit = 1 << (no_of_nodes - 1 - start)
+                if interactions >> k & 1:
+                    pos |= bit
+                else:
+                    neg |= bit
+        if pos or neg:
+            gate = GATE_AND if gates >> end & 1 else GATE_OR
+            rules[end] = (pos, neg, gate)
+    return rules
@@ -0,0 +1,302 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Symbolic attractor search with binary decision diagrams
+#
+#  State space is never enumerated. Fixed points are the solutions of
+#  AND_i (x_i <-> f_i(x)) and states on cycles of length k are the
+#  solutions of the same relation unrolled over k copies of the state
+#  variables (x^(t+1) = f(x^t) and x^0 = f(x^(k-1))). Both relations are
+#  built as reduced ordered BDDs. `symbolic_attractors` lists all their
+#  solutions, hence its work grows with the number of attractor states
+#  (e.g. 2^k fixed points for k nodes without inputs). `find` does not use
+#  this module, it is reached through
+#  `NetworkCombinations.get_symbolic_attractors`.
+
+from BooleanTRN.helpers.constants import *
+from BooleanTRN.models.transitions import get_node_rules, next_state
+
+
+class BDD:
+    """
+    Reduced ordered binary decision diagram. Every function is an integer
+    node id, 0 and 1 are the terminals and variables are tested in the
+    order of their index.
+    """
+
+    def __init__(self, no_of_vars: int):
+        self.no_of_vars = no_of_vars
+        # Terminals are placed below every variable
+        self._var = [no_of_vars, no_of_vars]
+        self._low = [0, 1]
+        self._high = [0, 1]
+        self._unique = {}
+        self._cache = {}
+
+    def _node(self, var: int, low: int, high: int) -> int:
+        if low == high:
+            return low
+        key = (var, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            node = len(self._var)
+            self._var.append(var)
+            self._low.append(low)
+            self._high.append(high)
+            self._unique[key] = node
+        return node
+
+    def _cofactors(self, node: int, var: int) -> tuple:
+        if self._var[node] != var:
+            return node, node
+        return self._low[node], self._high[node]
+
+    def var(self, index: int) -> int:
+        if index < 0 or index >= self.no_of_vars:
+            raise ValueError(f"Variable {index} is outside of the "
+                             f"diagram with {self.no_of_vars} variables")
+        return self._node(index, 0, 1)
+
+    def _terminal_case(self, f: int, g: int, h: int):
+        if f == 1:
+            return g
+        if f == 0:
+            return h
+        if g == h:
+            return g
+        if g == 1 and h == 0:
+            return f
+        return None
+
+    def ite(self, f: int, g: int, h: int) -> int:
+        """
+        If-then-else, which implements every other operation. Recursion is
+        replaced by explicit stack, hence depth of the diagram is not
+        limited by the Python recursion limit.
+        """
+        results = []
+        # (True, f, g, h) evaluates ite, (False, key, var, None) joins two
+        # results on top of the stack into a new node
+        work = [(True, f, g, h)]
+        while work:
+            expand, a, b, c = work.pop()
+            if not expand:
+                high = results.pop()
+                low = results.pop()
+                node = self._node(b, low, high)
+                self._cache[a] = node
+                results.append(node)
+                continue
+            node = self._terminal_case(a, b, c)
+            if node is None:
+                node = self._cache.get((a, b, c))
+            if node is not None:
+                results.append(node)
+                continue
+            var = min(self._var[a], self._var[b], self._var[c])
+            a0, a1 = self._cofactors(a, var)
+            b0, b1 = self._cofactors(b, var)
+            c0, c1 = self._cofactors(c, var)
+            work.append((False, (a, b, c), var, None))
+            work.append((True, a1, b1, c1))
+            work.append((True, a0, b0, c0))
+        return results.pop()
+
+    def neg(self, f: int) -> int:
+        return self.ite(f, 0, 1)
+
+    def conjoin(self, f: int, g: int) -> int:
+        return self.ite(f, g, 0)
+
+    def disjoin(self, f: int, g: int) -> int:
+        return self.ite(f, 1, g)
+
+    def equal(self, f: int, g: int) -> int:
+        return self.ite(f, g, self.neg(g))
+
+    def _reachable(self, f: int) -> list:
+        # Internal nodes below `f`, children always after their parents
+        # when sorted by variable
+        seen = {f}
+        stack = [f]
+        while stack:
+            node = stack.pop()
+            if node > 1:
+                for child in (self._low[node], self._high[node]):
+                    if child not in seen:
+                        seen.add(child)
+                        stack.append(child)
+        return sorted([x for x in seen if x > 1], key=lambda x: self._var[x])
+
+    def count(self, f: int) -> int:
+        """
+        Number of satisfying assignments of all variables
+        """
+        # Solutions below node, counted from the level of its variable
+        counts = {0: 0, 1: 1}
+        for node in reversed(self._reachable(f)):
+            low, high = self._low[node], self._high[node]
+            counts[node] = (
+                    (counts[low] << (self._var[low] - self._var[node] - 1)) +
+                    (counts[high] << (self._var[high] - self._var[node] - 1)))
+        return counts[f] << self._var[f]
+
+    def restrict(self, f: int, assignment: dict) -> int:
+        """
+        Cofactor of `f` in which given variables are fixed
+        :param f: Function
+        :param assignment: Dictionary of variable -> 0 or 1
+        :return: Function of the remaining variables
+        """
+        restricted = {0: 0, 1: 1}
+        for node in reversed(self._reachable(f)):
+            var = self._var[node]
+            low, high = self._low[node], self._high[node]
+            if var in assignment:
+                restricted[node] = restricted[high if assignment[var]
+                                              else low]
+            else:
+                restricted[node] = self._node(var, restricted[low],
+                                              restricted[high])
+        return restricted[f]
+
+    def solutions(self, f: int):
+        """
+        All satisfying assignments, variables skipped by the diagram are
+        expanded into both values. Number of produced assignments can be
+        exponential in the number of variables, use `restrict` to test
+        single assignment.
+        :return: Generator producing lists of 0/1 values for every variable
+        """
+        stack = [(f, 0, [])]
+        while stack:
+            node, level, values = stack.pop()
+            if node == 0:
+                continue
+            if level == self.no_of_vars:
+                yield values
+                continue
+            if self._var[node] > level:
+                children = (node, node)
+            else:
+                children = (self._low[node], self._high[node])
+            # High branch is pushed first, so that low branch comes first
+            stack.append((children[1], level + 1, values + [1]))
+            stack.append((children[0], level + 1, values + [0]))
+
+
+def _update_function(bdd: BDD, rule: tuple, inputs: list) -> int:
+    pos, neg, gate = rule
+    literals = []
+    for j, x in enumerate(inputs):
+        bit = 1 << (len(inputs) - 1 - j)
+        if pos & bit:
+            literals.append(x)
+        if neg & bit:
+            literals.append(bdd.neg(x))
+    if gate == GATE_AND:
+        function = 1
+        for x in literals:
+            function = bdd.conjoin(function, x)
+    else:
+        function = 0
+        for x in literals:
+            function = bdd.disjoin(function, x)
+    return function
+
+
+def _variable_order(rules: dict, no_of_nodes: int) -> list:
+    # Breadth first order over the undirected wiring, which keeps inputs
+    # of a node close to the node itself and hence diagrams small
+    neighbours = [set() for _ in range(no_of_nodes)]
+    for node, (pos, neg, _) in rules.items():
+        for j in range(no_of_nodes):
+            if (pos | neg) >> (no_of_nodes - 1 - j) & 1 and j != node:
+                neighbours[node].add(j)
+                neighbours[j].add(node)
+    order = []
+    placed = [False] * no_of_nodes
+    for root in sorted(range(no_of_nodes), key=lambda x: len(neighbours[x])):
+        if placed[root]:
+            continue
+        placed[root] = True
+        queue = [root]
+        for node in queue:
+            order.append(node)
+            for x in sorted(neighbours[node],
+                            key=lambda y: len(neighbours[y])):
+                if not placed[x]:
+                    placed[x] = True
+                    queue.append(x)
+    return order
+
+
+def _periodic_relation(rules: dict, no_of_nodes: int, length: int) -> tuple:
+    # Copies of the same node at all time steps are placed next to each
+    # other and nodes follow `_variable_order`
+    order = _variable_order(rules, no_of_nodes)
+    position = {n: k for k, n in enumerate(order)}
+    bdd = BDD(no_of_nodes * length)
+    steps = [[bdd.var(position[i] * length + t) for i in range(no_of_nodes)]
+             for t in range(length)]
+    relation = 1
+    for i in order:
+        for t in range(length):
+            current = steps[t]
+            future = steps[(t + 1) % length]
+            if i not in rules:
+                # Nodes without input keep their value
+                function = current[i]
+            else:
+                function = _update_function(bdd, rules[i], current)
+            relation = bdd.conjoin(relation, bdd.equal(future[i], function))
+    # Variables of the state at time 0 for every node
+    first = [position[i] * length for i in range(no_of_nodes)]
+    return bdd, relation, first
+
+
+def _periodic_states(rules: dict, no_of_nodes: int, length: int):
+    bdd, relation, first = _periodic_relation(rules, no_of_nodes, length)
+    for values in bdd.solutions(relation):
+        code = 0
+        for var in first:
+            code = (code << 1) | values[var]
+        yield code
+
+
+def symbolic_attractors(network, no_of_nodes: int,
+                        max_cycle_length: int = 0,
+                        default_gate: int = GATE_OR) -> tuple:
+    """
+    Fixed points and short limit cycles found without enumerating the
+    state space
+    :param network: Network in the tuple format or packed network
+    :param no_of_nodes: Number of nodes in the network
+    :param max_cycle_length: Limit cycles up to this length are searched
+    as well (0 for only fixed points). Longer cycles are not reported.
+    :param default_gate: Gate used when edge does not specify any gate
+    :return: list of fixed points and list of limit cycles (same as
+    `attractors.find_attractors`, every cycle starts from its smallest
+    state)
+    """
+    rules = get_node_rules(network, no_of_nodes, default_gate)
+    fixed_points = sorted(_periodic_states(rules, no_of_nodes, 1))
+    cycles = []
+    for length in range(2, max_cycle_length + 1):
+        seen = set()
+        for code in _periodic_states(rules, no_of_nodes, length):
+            if code in seen:
+                continue
+            cycle = [code]
+            state = next_state(rules, code, no_of_nodes)
+            while state != code:
+                cycle.append(state)
+                state = next_state(rules, state, no_of_nodes)
+            seen.update(cycle)
+            # States with period dividing the length are also solutions,
+            # they are reported only once with their own length
+            if len(cycle) == length:
+                start = cycle.index(min(cycle))
+                cycles.append(cycle[start:] + cycle[:start])
+    return fixed_points, sorted(cycles)
@@ -0,0 +1,274 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Vectorized state-space engine working on integer coded states
+#
+#  Every state is stored as an integer in which node `i` occupies bit
+#  (no_of_nodes - 1 - i). Hence binary representation of the state code is
+#  exactly the state string (e.g. "10110") used in rest of the project.
+
+import numpy as np
+
+from BooleanTRN.helpers.constants import *
+from BooleanTRN.models.packed import is_packed, packed_rules
+
+
+def state_to_code(state: str) -> int:
+    return int(state.strip(), 2)
+
+
+def code_to_state(code: int, no_of_nodes: int) -> str:
+    return format(int(code), f"0{no_of_nodes}b")
+
+
+def node_bit(node: int, no_of_nodes: int) -> int:
+    return 1 << (no_of_nodes - 1 - node)
+
+
+def get_node_rules(network, no_of_nodes: int,
+                   default_gate: int = GATE_OR) -> dict:
+    """
+    Update rule of every node which has at least one input
+    :param network: Network in the tuple format or packed network
+    :param no_of_nodes: Number of nodes in the network
+    :param default_gate: Gate used when edge does not specify any gate
+    :return: Dictionary of node -> (positive input mask, negative input
+    mask, gate)
+    """
+    if is_packed(network):
+        return packed_rules(network, no_of_nodes)
+    rules = {}
+    assigned = {}
+    for edge in network:
+        if edge[1] is None:
+            # Only node is added, it does not have any effect on dynamics
+            continue
+        start, end, interaction, gate = edge[:4]
+        if end in assigned and assigned[end] != gate:
+            raise AttributeError(
+                "Gate assignment error. Please check Gate "
+                "implementation.")
+        assigned[end] = gate
+        pos, neg = rules.get(end, (0, 0))
+        if interaction == INTERACTION_POSITIVE:
+            pos |= node_bit(start, no_of_nodes)
+        elif interaction == INTERACTION_NEGATIVE:
+            neg |= node_bit(start, no_of_nodes)
+        else:
+            raise AttributeError(
+                f"{interaction} is an invalid interaction "
+                f"code. Available codes are : "
+                f"{INTERACTION_POSITIVE} and "
+                f"{INTERACTION_NEGATIVE}")
+        rules[end] = (pos, neg)
+
+    for node, gate in assigned.items():
+        gate = gate or default_gate
+        if gate not in [GATE_OR, GATE_AND]:
+            raise AttributeError(f"{gate} is an invalid Gate code. "
+                                 f"Available codes are: {GATE_OR}, "
+                                 f"{GATE_AND}")
+        rules[node] = (*rules[node], gate)
+    return rules
+
+
+def next_state(rules: dict, state: int, no_of_nodes: int) -> int:
+    """
+    Successor of single state using plain integer arithmetic
+    :param rules: Output of `get_node_rules`
+    :param state: Integer code of the state
+    :param no_of_nodes: Number of nodes in the network
+    :return: Integer code of the next state
+    """
+    inverted = state ^ ((1 << no_of_nodes) - 1)
+    future = state
+    for node, (pos, neg, gate) in rules.items():
+        if gate == GATE_AND:
+            on = (state & pos) == pos and (inverted & neg) == neg
+        else:
+            on = (state & pos) != 0 or (inverted & neg) != 0
+        bit = node_bit(node, no_of_nodes)
+        if on:
+            future |= bit
+        else:
+            future &= ~bit
+    return future
+
+
+def get_node_masks(network, no_of_nodes: int,
+                   default_gate: int = GATE_OR) -> tuple:
+    """
+    Converts network into per-node input bitmasks
+    :param network: Network in the tuple format
+    :param no_of_nodes: Number of nodes in the network
+    :param default_gate: Gate used when edge does not specify any gate
+    :return: positive input masks, negative input masks, gates and boolean
+    array of nodes which have at least one input
+    """
+    positive = np.zeros(no_of_nodes, dtype=np.int64)
+    negative = np.zeros(no_of_nodes, dtype=np.int64)
+    gates = np.full(no_of_nodes, default_gate, dtype=np.int8)
+    has_input = np.zeros(no_of_nodes, dtype=bool)
+    for node, (pos, neg, gate) in get_node_rules(network, no_of_nodes,
+                                                 default_gate).items():
+        positive[node] = pos
+        negative[node] = neg
+        gates[node] = gate
+        has_input[node] = True
+    return positive, negative, gates, has_input
+
+
+def get_successors(masks: tuple, states, no_of_nodes: int) -> np.ndarray:
+    """
+    Synchronously updates all given states at once. Negative inputs are
+    evaluated on the state inverted by XOR and every node is reduced over
+    its masked input bits.
+    :param masks: Output of `get_node_masks`
+    :param states: Integer state codes
+    :param no_of_nodes: Number of nodes in the network
+    :return: Integer codes of next states
+    """
+    positive, negative, gates, has_input = masks
+    states = np.asarray(states, dtype=np.int64)
+    inverted = states ^ ((1 << no_of_nodes) - 1)
+    future = np.zeros_like(states)
+    for i in range(no_of_nodes):
+        bit = node_bit(i, no_of_nodes)
+        if not has_input[i]:
+            future |= states & bit
+            continue
+        pos, neg = positive[i], negative[i]
+        if gates[i] == GATE_AND:
+            on = ((states & pos) == pos) & ((inverted & neg) == neg)
+        else:
+            on = ((states & pos) != 0) | ((inverted & neg) != 0)
+        future |= on.astype(np.int64) * bit
+    return future
+
+
+def transition_table(masks: tuple, no_of_nodes: int) -> np.ndarray:
+    """
+    Successor of every possible state
+    :param masks: Output of `get_node_masks`
+    :param no_of_nodes: Number of nodes in the network
+    :return: int32 array of length 2^N where value at index `s` is the code
+    of the state following `s`
+    """
+    states = np.arange(1 << no_of_nodes, dtype=np.int64)
+    return get_successors(masks, states, no_of_nodes).astype(np.int32)
+
+
+def to_state_dict(transitions, no_of_nodes: int) -> dict:
+    """
+    Converts transition array into the dictionary of state strings. Keys
+    are inserted in the same order as `itertools.product([1, 0], ...)`
+    """
+    fmt = f"0{no_of_nodes}b"
+    future = np.asarray(transitions).tolist()
+    return {format(s, fmt): format(future[s], fmt)
+            for s in range(len(future) - 1, -1, -1)}
+
+
+def stack_node_masks(networks, no_of_nodes: int,
+                     default_gate: int = GATE_OR) -> tuple:
+    """
+    Packs wiring of many networks into stacked arrays of shape (K, N)
+    :param networks: List of networks in the tuple format
+    :param no_of_nodes: Number of nodes in each network
+    :param default_gate: Gate used when edge does not specify any gate
+    :return: Same fields as `get_node_masks` with extra network axis
+    """
+    masks = [get_node_masks(n, no_of_nodes, default_gate) for n in networks]
+    return tuple(np.stack(x) for x in zip(*masks))
+
+
+def batch_successors(masks: tuple, states, no_of_nodes: int) -> np.ndarray:
+    """
+    Successors of the same states in many networks at once
+    :param masks: Output of `stack_node_masks`
+    :param states: Integer state codes
+    :param no_of_nodes: Number of nodes in each network
+    :return: int64 array of shape (K, len(states))
+    """
+    positive, negative, gates, has_input = masks
+    states = np.asarray(states, dtype=np.int64)[None, :]
+    inverted = states ^ ((1 << no_of_nodes) - 1)
+    future = np.zeros((len(positive), states.shape[1]), dtype=np.int64)
+    for i in range(no_of_nodes):
+        bit = node_bit(i, no_of_nodes)
+        pos, neg = positive[:, i, None], negative[:, i, None]
+        any_on = ((states & pos) != 0) | ((inverted & neg) != 0)
+        all_on = ((states & pos) == pos) & ((inverted & neg) == neg)
+        on = np.where(gates[:, i, None] == GATE_AND, all_on, any_on)
+        on = np.where(has_input[:, i, None], on, (states & bit) != 0)
+        future |= on.astype(np.int64) * bit
+    return future
+
+
+def batch_transition_table(masks: tuple, no_of_nodes: int) -> np.ndarray:
+    """
+    Transition tables of many networks in single vectorized pass
+    :param masks: Output of `stack_node_masks`
+    :param no_of_nodes: Number of nodes in each network
+    :return: int32 array of shape (K, 2^N)
+    """
+    states = np.arange(1 << no_of_nodes, dtype=np.int64)
+    return batch_successors(masks, states, no_of_nodes).astype(np.int32)
+
+
+def batch_cycle_states(transitions: np.ndarray) -> np.ndarray:
+    """
+    Marks states which lie on an attractor (fixed point or limit cycle).
+    After 2^N steps every trajectory is inside its attractor, hence the
+    image of the transition map raised to 2^N (computed by repeated
+    squaring) is exactly the set of cyclic states.
+    :param transitions: int32 array of shape (K, 2^N)
+    :return: Boolean array of shape (K, 2^N)
+    """
+    jump = transitions
+    for _ in range(max(int(transitions.shape[1]).bit_length() - 1, 1)):
+        jump = np.take_along_axis(jump, jump, axis=1)
+    cyclic = np.zeros(transitions.shape, dtype=bool)
+    np.put_along_axis(cyclic, jump, True, axis=1)
+    return cyclic
+
+
+class IncrementalTransitions:
+    """
+    Transition table which keeps its value between networks. When rule of
+    single node changes only bit column of that node is recomputed for all
+    states, other columns are left untouched.
+    """
+
+    def __init__(self, no_of_nodes: int):
+        self.no_of_nodes = no_of_nodes
+        self.states = np.arange(1 << no_of_nodes, dtype=np.int64)
+        self._inverted = self.states ^ ((1 << no_of_nodes) - 1)
+        self.table = self.states.copy()
+
+    def reset(self):
+        """
+        Every node keeps its own value (network without any edge)
+        """
+        self.table = self.states.copy()
+
+    def set_node(self, node: int, positive: int, negative: int, gate: int):
+        """
+        Replaces update rule of single node
+        :param node: Node whose rule is changed
+        :param positive: Mask of positive inputs
+        :param negative: Mask of negative inputs
+        :param gate: Gate of the node
+        """
+        bit = node_bit(node, self.no_of_nodes)
+        if positive == 0 and negative == 0:
+            on = (self.states & bit) != 0
+        elif gate == GATE_AND:
+            on = ((self.states & positive) == positive) & (
+                    (self._inverted & negative) == negative)
+        else:
+            on = ((self.states & positive) != 0) | (
+                    (self._inverted & negative) != 0)
+        self.table &= ~bit
+        self.table |= on.astype(np.int64) * bit
@@ -16,6 +16,7 @@ import pygraphviz as pgv
 from SecretColors import Palette
 
 from BooleanTRN.helpers.constants import *
+from BooleanTRN.models.combinations import NetworkCombinations
 
 
 class GraphAdjustment:
@@ -99,21 +100,19 @@ def plot_transition_graph(data: dict,
     })
 
     d = pgv.AGraph(**graph_opt)
-    graph = nx.MultiDiGraph()
     for key, value in node_opt.items():
         d.node_attr[key] = value
     for key, value in edge_opt.items():
         d.edge_attr[key] = value
     for row, value in data.items():
         d.add_edge(row, value)
-        graph.add_edge(row, value)
-
-    for con in nx.attracting_components(graph):
-        if len(con) == 1:
-            d.get_node(list(con)[0]).attr['fillcolor'] = p.green(shade=30)
-        else:
-            for c in list(con):
-                d.get_node(c).attr['fillcolor'] = p.violet(shade=30)
+
+    ss, oc = NetworkCombinations.find_attracting_components(data)
+    for s in ss:
+        d.get_node(s).attr['fillcolor'] = p.green(shade=30)
+    for con in oc:
+        for c in con:
+            d.get_node(c).attr['fillcolor'] = p.violet(shade=30)
 
     if color_mapping is not None:
         for key, value in color_mapping.items():
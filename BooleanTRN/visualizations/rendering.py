@@ -0,0 +1,118 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Batch rendering of networks and state transition graphs
+#
+#  Every plot is named by the hash of its content and plotting options,
+#  hence plots which are already present in the output folder are not
+#  rendered again (e.g. after restarting interrupted run). `plot_network`
+#  and `plot_transition_graph` remain the functions for single plot.
+
+import hashlib
+import json
+import os
+from multiprocessing import Pool
+
+from BooleanTRN.helpers.common import imap_bounded
+
+KIND_NETWORK = "network"
+KIND_TRANSITION = "transition"
+
+# Plotting functions of `visualizations.networks` by their name. Module
+# needs Graphviz and matplotlib, hence it is imported only when an image
+# is drawn.
+_PLOTS = {
+    KIND_NETWORK: "plot_network",
+    KIND_TRANSITION: "plot_transition_graph"
+}
+
+
+def _plot_function(kind: str):
+    plot = _PLOTS[kind]
+    if isinstance(plot, str):
+        from BooleanTRN.visualizations import networks
+        plot = getattr(networks, plot)
+    return plot
+
+
+def content_hash(data, kind: str, layout: str, options: dict) -> str:
+    """
+    Hash of everything which changes the rendered image
+    :param data: Network in the tuple format or state space dictionary
+    :param kind: KIND_NETWORK or KIND_TRANSITION
+    :param layout: Graphviz layout program
+    :param options: Other keyword arguments of the plotting function
+    :return: Hexadecimal digest
+    """
+    text = json.dumps([kind, data, layout, options], sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _render(job: tuple) -> str:
+    kind, data, layout, options, filename = job
+    # Image is moved to its final name only when it is completely written.
+    # Temporary name is unique per process as other run can render the
+    # same image into the same folder
+    base, ext = os.path.splitext(filename)
+    tmp = f"{base}.{os.getpid()}.tmp{ext}"
+    _plot_function(kind)(data, layout=layout, filename=tmp, **options)
+    os.replace(tmp, filename)
+    return filename
+
+
+def render_all(items, kind: str = KIND_NETWORK, *,
+               out_folder: str = "plots",
+               layout: str = None,
+               workers: int = None,
+               max_pending: int = None,
+               **options) -> list:
+    """
+    Renders many networks or state spaces on a pool of worker processes.
+    All images are written before the function returns.
+    :param items: Iterable of networks in the tuple format (KIND_NETWORK)
+    or state space dictionaries (KIND_TRANSITION)
+    :param kind: KIND_NETWORK or KIND_TRANSITION
+    :param out_folder: Folder for the images
+    :param layout: Graphviz layout program (default: same as the single
+    plot function)
+    :param workers: Number of worker processes (default: CPU count)
+    :param max_pending: Maximum number of plots being rendered at once
+    (default: twice the number of workers)
+    :param options: Other keyword arguments of the plotting function (
+    e.g. `graph_opt`)
+    :return: List of image filenames for every item in the input order.
+    Existing images and repeated items are not rendered again.
+    """
+    if kind not in _PLOTS:
+        raise ValueError(f"{kind} is an invalid plot kind. Available kinds "
+                         f"are : {list(_PLOTS.keys())}")
+    if layout is None:
+        layout = "dot" if kind == KIND_NETWORK else "neato"
+    if "filename" in options:
+        raise ValueError("Filenames are generated from the content, use "
+                         "`out_folder` instead")
+    workers = workers or os.cpu_count()
+    max_pending = max_pending or 2 * workers
+    if not os.path.exists(out_folder):
+        os.makedirs(out_folder)
+
+    filenames = []
+    submitted = set()
+
+    def _jobs():
+        # Only images which are neither on the disk nor already submitted
+        # are sent to the workers
+        for data in items:
+            key = content_hash(data, kind, layout, options)
+            filename = os.path.join(out_folder, f"{kind}_{key}.png")
+            filenames.append(filename)
+            if filename in submitted or os.path.exists(filename):
+                continue
+            submitted.add(filename)
+            yield kind, data, layout, options, filename
+
+    with Pool(workers) as pool:
+        for _ in imap_bounded(pool, _render, _jobs(), max_pending):
+            pass
+    return filenames
@@ -5,7 +5,7 @@
 #  Analysis related to the finding network structures from the combination
 #  of networks derived from this analysis
 
-import math
+from BooleanTRN.helpers.constants import *
 from BooleanTRN.models.combinations import NetworkCombinations
 import matplotlib.pyplot as plt
 from SecretColors import Palette
@@ -16,13 +16,6 @@ from matplotlib import ticker
 matplotlib.rc("font", family="IBM Plex Sans")
 
 
-def permutations(n, r):
-    try:
-        return math.factorial(n) / math.factorial(n - r)
-    except ValueError:
-        return 0
-
-
 @ticker.FuncFormatter
 def major_formatter(x, pos):
     return f'{x / 10000}'
@@ -31,48 +24,20 @@ def major_formatter(x, pos):
 def plot_combination_stat(nodes: int, edges: int, add_connected: bool = False):
     p = Palette()
 
-    def __count(n: NetworkCombinations):
-        c = 0
-        for _ in n.find():
-            c += 1
-        return c
-
     values = []
     labels = []
     connected = []
     nc = NetworkCombinations(nodes, edges)
 
-    pairs = permutations(nodes, 2) + nodes
-    interactions = permutations(pairs, edges) / math.factorial(edges)
-
-    # 1 interaction, 1 gate
-    values.append(interactions)
-    if add_connected:
-        nc.is_connected = True
-        connected.append(__count(nc))
-        nc.is_connected = False
-    labels.append((1, 1))
-
-    # 1 interaction, 2 gates
-    nc.gates = [0, 1]
-    values.append(__count(nc))
-    if add_connected:
-        nc.is_connected = True
-        connected.append(__count(nc))
-        nc.is_connected = False
-    labels.append((1, 2))
-
-    # 2 interaction, 1 gate
-    values.append(values[0] * pow(2, edges))
-    if add_connected:
-        connected.append(connected[0] * pow(2, edges))
-    labels.append((2, 1))
-
-    # 2 interactions, 2 gates
-    values.append(values[1] * pow(2, edges))
-    if add_connected:
-        connected.append(connected[1] * pow(2, edges))
-    labels.append((2, 2))
+    for it, gt in [(1, 1), (1, 2), (2, 1), (2, 2)]:
+        interactions = [INTERACTION_POSITIVE, INTERACTION_NEGATIVE][:it]
+        gates = [GATE_OR, GATE_AND][:gt]
+        values.append(nc.count(connected=False, gates=gates,
+                               interactions=interactions))
+        if add_connected:
+            connected.append(nc.count(connected=True, gates=gates,
+                                      interactions=interactions))
+        labels.append((it, gt))
 
     plt.barh(range(len(values)), values, color=p.blue(), zorder=4)
     if add_connected:
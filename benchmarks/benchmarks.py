@@ -0,0 +1,320 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Benchmarks of all stages of the network pipeline
+#
+#  Classes follow airspeed velocity (asv) naming (`time_*`, `peakmem_*`,
+#  `track_*`). The same grid can be run without asv:
+#
+#       python benchmarks/benchmarks.py --output bench.json
+#
+#  Every case then runs in a fresh process, so peak RSS of one case does
+#  not leak into another.
+
+import argparse
+import itertools as itr
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from multiprocessing import Process, Queue
+from queue import Empty
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from BooleanTRN.analysis.networks import (generate_iso_networks,
+                                          get_steady_state_isomorphs)
+from BooleanTRN.helpers.common import find_isomorphic_networks
+from BooleanTRN.models.combinations import NetworkCombinations
+
+# (nodes, edges, gates, interactions)
+GRID = [
+    (3, 3, (0,), (1,)),
+    (3, 3, (0, 1), (0, 1)),
+    (4, 4, (0,), (1,)),
+    (4, 4, (0, 1), (0, 1)),
+    (4, 5, (0, 1), (0, 1)),
+    (5, 5, (0, 1), (0, 1)),
+]
+
+# Maximum number of networks used by each stage
+SAMPLE = 2000
+
+
+def _network_combinations(settings: tuple) -> NetworkCombinations:
+    nodes, edges, gates, interactions = settings
+    return NetworkCombinations(nodes, edges, only_connected=True,
+                               gates=list(gates),
+                               interactions=list(interactions))
+
+
+def _targets(nodes: int) -> list:
+    return ["1" * nodes, ("10" * nodes)[:nodes]]
+
+
+def _sample(nc: NetworkCombinations, size: int) -> list:
+    return list(itr.islice(nc.get_combinations(), size))
+
+
+def _find_case(nc: NetworkCombinations, size: int, mode: str,
+               ignore_oscillations: bool) -> tuple:
+    # Keyword arguments of `find` and number of labelled candidates which
+    # they cover. Throughput of every mode is counted over the covered
+    # candidates, not over the found networks.
+    kwargs = dict(FIND_MODES[mode], ignore_oscillations=ignore_oscillations)
+    if mode == "pruned":
+        # Pruned search is only used for the whole range
+        if not ignore_oscillations:
+            raise NotImplementedError("Pruned search needs "
+                                      "ignore_oscillations")
+        return kwargs, nc.count()
+    # Edge sets which give approximately `size` candidates
+    per_set = max(nc.count() // max(nc.get_pair_count(), 1), 1)
+    kwargs["stop"] = max(size // per_set, 1)
+    if mode == "non_isomorphic":
+        # Every representative stands for its whole isomorphism class.
+        # First edge sets are rarely canonical, hence the range is widened
+        # until it covers enough classes.
+        while True:
+            scanned = sum([k for _, k in nc.get_non_isomorphic(
+                stop=kwargs["stop"], with_orbit_size=True)])
+            if scanned >= size or kwargs["stop"] >= nc.get_pair_count():
+                break
+            kwargs["stop"] *= 2
+    else:
+        scanned = sum(1 for _ in nc.get_combinations(stop=kwargs["stop"]))
+    return kwargs, scanned
+
+
+def _bench_combinations(nc, size):
+    return sum(1 for _ in itr.islice(nc.get_combinations(), size))
+
+
+def _bench_state_space(nc, sample):
+    for n in sample:
+        nc.get_state_space(n)
+    return len(sample)
+
+
+def _bench_find(nc, data):
+    kwargs, scanned = data
+    list(nc.find(_targets(nc.no_of_nodes), **kwargs))
+    return scanned
+
+
+def _bench_isomorphs(nc, sample):
+    find_isomorphic_networks(sample)
+    return len(sample)
+
+
+def _bench_iso_networks(nc, sample):
+    with tempfile.TemporaryDirectory() as folder:
+        generate_iso_networks(sample, chunks=max(len(sample) // 4, 1),
+                              workers=2, show_progress=False,
+                              filename=os.path.join(folder, "iso.txt"))
+    return len(sample)
+
+
+def _bench_ss_isomorphs(nc, sample):
+    with tempfile.TemporaryDirectory() as folder:
+        get_steady_state_isomorphs(sample, nc,
+                                   chunks=max(len(sample) // 4, 1),
+                                   show_progress=False,
+                                   filename=os.path.join(folder, "ss.txt"))
+    return len(sample)
+
+
+# Stage name -> (function to prepare input, timed function)
+STAGES = {
+    "get_combinations": (lambda nc, size: size, _bench_combinations),
+    "get_state_space": (_sample, _bench_state_space),
+    "find_isomorphic_networks": (_sample, _bench_isomorphs),
+    "generate_iso_networks": (_sample, _bench_iso_networks),
+    "get_steady_state_isomorphs": (_sample, _bench_ss_isomorphs),
+}
+
+
+# Keyword arguments of `find` for every code path. "pruned" runs over the
+# whole range, which `find` serves by `get_ss_combinations`.
+FIND_MODES = {
+    "default": {},
+    "batch": {"batch_size": 1000},
+    "incremental": {"incremental": True},
+    "non_isomorphic": {"non_isomorphic": True},
+    "pruned": {},
+}
+
+
+class PipelineSuite:
+    params = (GRID, list(STAGES))
+    param_names = ["settings", "stage"]
+    timeout = 600
+
+    def setup(self, settings, stage):
+        self.nc = _network_combinations(settings)
+        self.data = STAGES[stage][0](self.nc, SAMPLE)
+
+    def time_stage(self, settings, stage):
+        STAGES[stage][1](self.nc, self.data)
+
+    def peakmem_stage(self, settings, stage):
+        STAGES[stage][1](self.nc, self.data)
+
+    def track_throughput(self, settings, stage):
+        begin = time.perf_counter()
+        count = STAGES[stage][1](self.nc, self.data)
+        return count / (time.perf_counter() - begin)
+
+    track_throughput.unit = "networks/s"
+
+
+class FindSuite:
+    params = (GRID, list(FIND_MODES), [False, True])
+    param_names = ["settings", "mode", "ignore_oscillations"]
+    timeout = 600
+
+    def setup(self, settings, mode, ignore_oscillations):
+        # NotImplementedError marks the case as skipped in asv
+        self.nc = _network_combinations(settings)
+        self.data = _find_case(self.nc, SAMPLE, mode, ignore_oscillations)
+
+    def time_find(self, settings, mode, ignore_oscillations):
+        _bench_find(self.nc, self.data)
+
+    def peakmem_find(self, settings, mode, ignore_oscillations):
+        _bench_find(self.nc, self.data)
+
+    def track_throughput(self, settings, mode, ignore_oscillations):
+        begin = time.perf_counter()
+        count = _bench_find(self.nc, self.data)
+        return count / (time.perf_counter() - begin)
+
+    track_throughput.unit = "networks/s"
+
+
+def _peak_rss() -> int:
+    # ru_maxrss is in kilobytes on Linux
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children)
+
+
+def _cases(stages: list) -> list:
+    # (stage, find mode, ignore_oscillations) for every requested stage
+    cases = []
+    for stage in stages:
+        if stage == "find":
+            cases.extend([(stage, m, x) for m in FIND_MODES
+                          for x in [False, True]
+                          if m != "pruned" or x])
+        else:
+            cases.append((stage, None, None))
+    return cases
+
+
+def _case_name(settings: tuple, case: tuple) -> str:
+    stage, mode, ignore_oscillations = case
+    if mode is not None:
+        stage = f"{stage}:{mode}"
+        if ignore_oscillations:
+            stage = f"{stage}:fixed"
+    return (f"n{settings[0]}e{settings[1]} "
+            f"G{len(settings[2])}I{len(settings[3])} {stage:<30}")
+
+
+def _run_case(q: Queue, settings: tuple, case: tuple, size: int):
+    stage, mode, ignore_oscillations = case
+    nc = _network_combinations(settings)
+    if stage == "find":
+        data = _find_case(nc, size, mode, ignore_oscillations)
+        bench = _bench_find
+    else:
+        data = STAGES[stage][0](nc, size)
+        bench = STAGES[stage][1]
+    begin = time.perf_counter()
+    count = bench(nc, data)
+    elapsed = time.perf_counter() - begin
+    q.put({
+        "networks": count,
+        "seconds": elapsed,
+        "networks_per_second": count / elapsed if elapsed > 0 else None,
+        "peak_rss_kb": _peak_rss()
+    })
+
+
+def _wait(q: Queue, p: Process, timeout: float):
+    # Result of the child, or None if it died or did not finish in time
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return q.get(timeout=1)
+        except Empty:
+            if p.exitcode is not None or time.monotonic() > deadline:
+                return None
+
+
+def run(stages: list = None, size: int = SAMPLE, output: str = None,
+        timeout: float = 600) -> list:
+    """
+    Runs every (settings, stage) case of the grid in separate process.
+    Stage "find" is run once for every mode in `FIND_MODES` with and
+    without `ignore_oscillations`.
+    :param stages: Stages to be benchmarked (default: all)
+    :param size: Maximum number of networks used by each stage
+    :param output: Optional JSON file for the results
+    :param timeout: Seconds after which a case is stopped
+    :return: List of results. Failed cases have "error" instead of the
+    measurements.
+    """
+    if stages is None:
+        stages = list(STAGES) + ["find"]
+    results = []
+    for settings in GRID:
+        for case in _cases(stages):
+            q = Queue()
+            p = Process(target=_run_case, args=(q, settings, case, size))
+            p.start()
+            measured = _wait(q, p, timeout)
+            if p.is_alive():
+                p.terminate()
+            p.join()
+            result = {
+                "nodes": settings[0],
+                "edges": settings[1],
+                "gates": list(settings[2]),
+                "interactions": list(settings[3]),
+                "stage": case[0],
+                "mode": case[1],
+                "ignore_oscillations": case[2]
+            }
+            if measured is None:
+                result["error"] = f"exit code {p.exitcode}"
+                print(f"{_case_name(settings, case)} failed with "
+                      f"{result['error']}")
+            else:
+                result.update(measured)
+                print(f"{_case_name(settings, case)} "
+                      f"{result['networks_per_second'] or 0:>12.1f} "
+                      f"networks/s {result['peak_rss_kb']:>10} KB")
+            results.append(result)
+    if output is not None:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BooleanTRN benchmarks")
+    parser.add_argument("--stages", nargs="*",
+                        choices=list(STAGES) + ["find"],
+                        help="Stages to benchmark (default: all)")
+    parser.add_argument("--sample", type=int, default=SAMPLE,
+                        help="Maximum number of networks per stage")
+    parser.add_argument("--output", help="JSON file for the results")
+    parser.add_argument("--timeout", type=float, default=600,
+                        help="Seconds after which a case is stopped")
+    args = parser.parse_args()
+    run(args.stages, args.sample, args.output, args.timeout)
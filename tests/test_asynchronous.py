@@ -0,0 +1,89 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Asynchronous attractors and basins cross-checked with networkx
+
+import itertools as itr
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from BooleanTRN.models.asynchronous import (async_transition_matrix,
+                                            find_async_attractors,
+                                            async_basins)
+from BooleanTRN.models.combinations import NetworkCombinations
+from BooleanTRN.models.transitions import get_node_masks
+
+SETTINGS = [
+    (3, 3, True, [0, 1], [0, 1]),
+    (3, 5, False, [0, 1], [0, 1]),
+    (3, 7, False, [0, 1], [0, 1]),
+]
+
+
+def _sample(settings: tuple, size: int = 150) -> list:
+    random.seed(settings[0] * 100 + settings[1])
+    networks = list(itr.islice(
+        NetworkCombinations(*settings).get_combinations(), 20000))
+    return random.sample(networks, min(size, len(networks)))
+
+
+def _async_graph(nc: NetworkCombinations, network: list) -> nx.DiGraph:
+    # Every node is updated alone from the synchronous successor, updates
+    # which do not change the state are left out
+    transitions = nc.get_transitions(network).tolist()
+    g = nx.DiGraph()
+    g.add_nodes_from(range(len(transitions)))
+    for state, successor in enumerate(transitions):
+        for i in range(nc.no_of_nodes):
+            bit = 1 << (nc.no_of_nodes - 1 - i)
+            if (state ^ successor) & bit:
+                g.add_edge(state, state ^ bit)
+    return g
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+def test_async_transition_matrix(settings):
+    nc = NetworkCombinations(*settings)
+    for n in _sample(settings):
+        masks = get_node_masks(n, nc.no_of_nodes)
+        matrix = async_transition_matrix(masks, nc.no_of_nodes)
+        coo = matrix.tocoo()
+        edges = set(zip(coo.row.tolist(), coo.col.tolist()))
+        assert edges == set(_async_graph(nc, n).edges)
+        assert matrix.nnz == len(edges)
+        assert (matrix != nc.get_async_transitions(n)).nnz == 0
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+def test_find_async_attractors(settings):
+    nc = NetworkCombinations(*settings)
+    for n in _sample(settings):
+        fixed_points, attractors = find_async_attractors(
+            nc.get_async_transitions(n))
+        expected = sorted([sorted(x) for x in
+                           nx.attracting_components(_async_graph(nc, n))])
+        assert fixed_points == [x[0] for x in expected if len(x) == 1]
+        assert attractors == [x for x in expected if len(x) > 1]
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+def test_async_basins(settings):
+    nc = NetworkCombinations(*settings)
+    for n in _sample(settings):
+        g = _async_graph(nc, n)
+        matrix = nc.get_async_transitions(n)
+        fixed_points, attractors = find_async_attractors(matrix)
+        components = [[x] for x in fixed_points] + attractors
+        basins = async_basins(matrix, components)
+        assert basins.shape == (len(components), 1 << nc.no_of_nodes)
+        for basin, component in zip(basins, components):
+            expected = set(component)
+            for x in component:
+                expected |= nx.ancestors(g, x)
+            assert set(np.flatnonzero(basin).tolist()) == expected
+        # Every state reaches at least one attractor
+        assert basins.any(axis=0).all()
@@ -0,0 +1,66 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Attractors on integer successor arrays cross-checked with networkx
+
+import itertools as itr
+import random
+
+import networkx as nx
+import pytest
+
+from BooleanTRN.models.attractors import find_attractors
+from BooleanTRN.models.combinations import NetworkCombinations
+
+SETTINGS = [
+    (3, 3, True, [0, 1], [0, 1]),
+    (4, 5, True, [0, 1], [0, 1]),
+    (5, 6, False, [0, 1], [0, 1]),
+]
+
+
+def _sample(settings: tuple, size: int = 150) -> list:
+    random.seed(settings[0] * 100 + settings[1])
+    networks = list(itr.islice(
+        NetworkCombinations(*settings).get_combinations(), 20000))
+    return random.sample(networks, min(size, len(networks)))
+
+
+def _components(fixed_points: list, cycles: list) -> set:
+    return set([frozenset([x]) for x in fixed_points] +
+               [frozenset(x) for x in cycles])
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+def test_find_attractors_matches_networkx(settings):
+    nc = NetworkCombinations(*settings)
+    for n in _sample(settings):
+        transitions = nc.get_transitions(n)
+        fixed_points, cycles = find_attractors(transitions)
+        g = nx.DiGraph(list(enumerate(transitions.tolist())))
+        expected = set([frozenset(x) for x in nx.attracting_components(g)])
+        assert _components(fixed_points, cycles) == expected
+        # Cycles are listed in the order of transitions
+        for c in cycles:
+            assert [transitions[x] for x in c] == c[1:] + c[:1]
+
+
+@pytest.mark.parametrize("settings", SETTINGS[:2])
+def test_find_attracting_components_matches_networkx(settings):
+    nc = NetworkCombinations(*settings)
+    for n in _sample(settings, 50):
+        space = nc.get_state_space(n)
+        fixed_points, cycles = nc.find_attracting_components(space)
+        expected = set([frozenset(x) for x in
+                        nx.attracting_components(nx.DiGraph(
+                            list(space.items())))])
+        assert _components(fixed_points, cycles) == expected
+
+
+def test_find_attracting_components_partial():
+    assert NetworkCombinations.find_attracting_components(
+        {"11": "10", "10": "10"}) == (["10"], [])
+    # Missing successor is a fixed point, labels can be anything
+    assert NetworkCombinations.find_attracting_components(
+        {"a": "b", "c": "d", "d": "c"}) == (["b"], [["c", "d"]])
@@ -0,0 +1,85 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Basins and transients cross-checked by walking every trajectory
+
+import random
+
+import numpy as np
+import pytest
+
+from BooleanTRN.analysis.basins import (batch_basins, basin_statistics,
+                                        target_basin_fractions, rank_networks)
+from BooleanTRN.models.combinations import NetworkCombinations
+
+
+def _walk(successors: list) -> tuple:
+    # Label, transient length and attractor flag of every state
+    labels, transients, cyclic = [], [], []
+    for state in range(len(successors)):
+        path = [state]
+        while successors[path[-1]] not in path:
+            path.append(successors[path[-1]])
+        start = path.index(successors[path[-1]])
+        labels.append(min(path[start:]))
+        transients.append(start)
+        cyclic.append(start == 0)
+    return labels, transients, cyclic
+
+
+def _random_tables(no_of_nodes: int, count: int) -> np.ndarray:
+    random.seed(no_of_nodes)
+    size = 1 << no_of_nodes
+    return np.asarray([[random.randrange(size) for _ in range(size)]
+                       for _ in range(count)])
+
+
+def _chain(size: int) -> list:
+    # Longest possible transient ending in a fixed point
+    return [0] + list(range(size - 1))
+
+
+@pytest.mark.parametrize("no_of_nodes", [1, 2, 3, 5, 7])
+def test_batch_basins_match_walk(no_of_nodes):
+    size = 1 << no_of_nodes
+    tables = np.concatenate([_random_tables(no_of_nodes, 20),
+                             [_chain(size)], [list(range(size))],
+                             [[(x + 1) % size for x in range(size)]]])
+    labels, transients, cyclic = batch_basins(tables)
+    for k, table in enumerate(tables.tolist()):
+        expected = _walk(table)
+        assert labels[k].tolist() == expected[0]
+        assert transients[k].tolist() == expected[1]
+        assert cyclic[k].tolist() == expected[2]
+
+
+def test_single_table():
+    labels, transients, _ = batch_basins(_chain(16))
+    assert labels.shape == (1, 16)
+    assert transients[0].tolist() == list(range(16))
+    stats = basin_statistics(_chain(16))
+    assert list(stats) == [0]
+    assert stats[0]["max_transient"] == 15
+
+
+def test_target_basin_fractions():
+    # 0 and 3 are fixed points, 1 -> 0 and 2 -> 1
+    each, total = target_basin_fractions([[0, 0, 1, 3]], ["00", "01", "11"])
+    assert each.tolist() == [[0.75, 0, 0.25]]
+    assert total.tolist() == [1.0]
+
+
+def test_rank_networks():
+    nc = NetworkCombinations(3, 3, True, [0, 1], [0, 1])
+    networks = list(nc.get_combinations())
+    target = ["111"]
+    ranked = rank_networks(networks, 3, target, batch_size=64)
+    expected = []
+    for n in networks:
+        labels, _, cyclic = _walk(nc.get_transitions(n).tolist())
+        # Target outside of attractors has empty basin
+        expected.append(labels.count(labels[7]) / 8 if cyclic[7] else 0)
+    assert [x[0] for x in ranked] == sorted(expected, reverse=True)
+    assert rank_networks(networks, 3, target, batch_size=64, top=5) == \
+        ranked[:5]
@@ -0,0 +1,71 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Round trip of the binary network format
+
+import json
+
+import pytest
+
+from BooleanTRN.helpers.binary import (BinaryNetworks, write_binary_networks,
+                                       text_to_binary, binary_to_text)
+from BooleanTRN.models.combinations import NetworkCombinations
+from BooleanTRN.models.packed import pack_network
+
+NETWORKS = [
+    [(0, 1, 1, 0), (1, 2, 0, None)],
+    [(2, 0, None, 1), (0, 0, 1, 1)],
+    [(254, 3, 1, 0), (1, 254, 0, 0)]
+]
+
+
+def test_round_trip(tmp_path):
+    filename = str(tmp_path / "networks.btrn")
+    assert write_binary_networks(NETWORKS, filename, 255, 2) == 3
+    reader = BinaryNetworks(filename)
+    assert len(reader) == 3
+    assert list(reader) == NETWORKS
+    assert reader[2] == NETWORKS[2]
+    assert list(reader[1:]) == NETWORKS[1:]
+
+
+def test_packed_input(tmp_path):
+    filename = str(tmp_path / "networks.btrn")
+    nc = NetworkCombinations(3, 3)
+    networks = list(nc.get_combinations(0, 50))
+    packed = [pack_network(x, 3) for x in networks]
+    write_binary_networks(packed, filename, 3, 3)
+    assert [sorted(x) for x in BinaryNetworks(filename)] == [
+        sorted(x) for x in networks]
+
+
+@pytest.mark.parametrize("edge", [(255, 1, 1, 0), (0, 1, 255, 0),
+                                  (0, 1, 1, 255), (-1, 1, 1, 0)])
+def test_out_of_range_values(tmp_path, edge):
+    # 255 is the code of None and can not be used as a real value
+    with pytest.raises(ValueError):
+        write_binary_networks([[edge]], str(tmp_path / "n.btrn"), 256, 1)
+
+
+def test_text_conversion(tmp_path):
+    text = tmp_path / "networks.txt"
+    with open(text, "w") as f:
+        for n in NETWORKS:
+            print(json.dumps(n), file=f)
+        print("", file=f)
+    binary = str(tmp_path / "networks.btrn")
+    assert text_to_binary(str(text), binary, 255) == 3
+    back = str(tmp_path / "back.txt")
+    assert binary_to_text(binary, back) == 3
+    with open(back) as f:
+        assert [json.loads(x) for x in f] == [
+            [list(e) for e in n] for n in NETWORKS]
+
+
+def test_empty_text(tmp_path):
+    text = tmp_path / "empty.txt"
+    text.write_text("")
+    binary = str(tmp_path / "empty.btrn")
+    assert text_to_binary(str(text), binary, 3) == 0
+    assert len(BinaryNetworks(binary)) == 0
@@ -0,0 +1,79 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Counting, ranges and encodings of generated networks
+
+import pytest
+
+from BooleanTRN.models.combinations import NetworkCombinations
+from BooleanTRN.models.packed import pack_network, unpack_network
+
+SETTINGS = [
+    (2, 2, False, [0], [1]),
+    (3, 3, True, [0, 1], [0, 1]),
+    (3, 4, False, [0, 1], [1]),
+    (3, 5, True, [1], [0, 1]),
+    (4, 4, True, [0, 1], [0, 1]),
+    (4, 3, True, [0], [1]),
+]
+
+
+def _key(network) -> tuple:
+    # Sortable form of the network, None gate is placed first
+    return tuple(sorted([tuple([-1 if x is None else x for x in edge])
+                         for edge in network]))
+
+
+@pytest.mark.parametrize("settings", SETTINGS[1:5])
+def test_ranges_cover_all_networks(settings):
+    nc = NetworkCombinations(*settings)
+    middle = nc.get_pair_count() // 3
+    parts = list(nc.get_combinations(stop=middle)) + list(
+        nc.get_combinations(start=middle))
+    assert parts == list(nc.get_combinations())
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+def test_packed_combinations(settings):
+    nc = NetworkCombinations(*settings)
+    networks = list(nc.get_combinations())
+    expected = [pack_network(x, settings[0]) for x in networks]
+    assert list(nc.get_combinations(packed=True)) == expected
+    assert list(nc.get_combinations(1, 5, packed=True)) == [
+        pack_network(x, settings[0]) for x in nc.get_combinations(1, 5)]
+    assert [_key(unpack_network(x, settings[0])) for x in expected] == [
+        _key(x) for x in networks]
+
+
+def test_packed_invalid_interaction():
+    nc = NetworkCombinations(2, 1, interactions=[1, 2])
+    with pytest.raises(ValueError):
+        list(nc.get_combinations(packed=True))
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+def test_count_matches_enumeration(settings):
+    nc = NetworkCombinations(*settings)
+    assert nc.count() == sum(1 for _ in nc.get_combinations())
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+def test_count_options(settings):
+    nc = NetworkCombinations(*settings)
+    for connected in [True, False]:
+        other = NetworkCombinations(settings[0], settings[1], connected,
+                                    settings[3], settings[4])
+        assert nc.count(connected=connected) == sum(
+            1 for _ in other.get_combinations())
+
+
+@pytest.mark.parametrize("settings", SETTINGS[1:5])
+def test_incremental_tables(settings):
+    nc = NetworkCombinations(*settings)
+    # Gray code changes the order, not the networks
+    tables = [(n, t.tolist()) for n, t in nc.get_incremental(stop=40)]
+    assert sorted([_key(n) for n, _ in tables]) == sorted(
+        [_key(n) for n in nc.get_combinations(stop=40)])
+    for n, table in tables:
+        assert table == nc.get_transitions(n).tolist()
@@ -0,0 +1,135 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Code paths of `find` cross-checked by walking every trajectory
+
+import pytest
+
+from BooleanTRN.helpers.common import canonical_form
+from BooleanTRN.models.combinations import NetworkCombinations
+
+SETTINGS = [
+    (3, 3, True, [0, 1], [0, 1]),
+    (3, 4, False, [0, 1], [1]),
+    (4, 3, True, [0, 1], [0, 1]),
+]
+
+TARGETS = {
+    3: [["111", "101"], ["000"], ["110", "011"]],
+    4: [["1111", "1010"], ["0110"]],
+}
+
+
+def _key(network) -> tuple:
+    # Sortable form of the network, None gate is placed first
+    return tuple(sorted([tuple([-1 if x is None else x for x in edge])
+                         for edge in network]))
+
+
+def _attractor_states(successors: list) -> tuple:
+    # Fixed points and states on limit cycles
+    fixed_points, cyclic = set(), set()
+    for state in range(len(successors)):
+        path = [state]
+        while successors[path[-1]] not in path:
+            path.append(successors[path[-1]])
+        cycle = path[path.index(successors[path[-1]]):]
+        if len(cycle) == 1:
+            fixed_points.update(cycle)
+        else:
+            cyclic.update(cycle)
+    return fixed_points, cyclic
+
+
+def _expected(nc: NetworkCombinations, target: list, strict: bool,
+              ignore_oscillations: bool,
+              ignore_steady_states: bool) -> list:
+    codes = [int(x, 2) for x in target]
+    how = all if strict else any
+    found = []
+    for n in nc.get_combinations():
+        fixed_points, cyclic = _attractor_states(
+            nc.get_transitions(n).tolist())
+        if not ignore_steady_states and how(
+                [x in fixed_points for x in codes]):
+            found.append(_key(n))
+        elif not ignore_oscillations and how([x in cyclic for x in codes]):
+            found.append(_key(n))
+    return sorted(found)
+
+
+def _modes(nc: NetworkCombinations) -> dict:
+    # Keyword arguments of every code path of `find`. Whole range can be
+    # served by pruned search, explicit range is always scanned.
+    stop = nc.get_pair_count()
+    return {
+        "full_range": {},
+        "default": {"stop": stop},
+        "batch": {"batch_size": 7, "stop": stop},
+        "incremental": {"incremental": True, "stop": stop},
+    }
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+@pytest.mark.parametrize("strict", [True, False])
+@pytest.mark.parametrize("ignore_oscillations", [True, False])
+@pytest.mark.parametrize("ignore_steady_states", [True, False])
+def test_find_paths(settings, strict, ignore_oscillations,
+                    ignore_steady_states):
+    nc = NetworkCombinations(*settings)
+    options = dict(strict=strict, ignore_oscillations=ignore_oscillations,
+                   ignore_steady_states=ignore_steady_states)
+    for target in TARGETS[settings[0]]:
+        expected = _expected(nc, target, **options)
+        for name, kwargs in _modes(nc).items():
+            found = [_key(x) for x in nc.find(target, **options, **kwargs)]
+            assert sorted(found) == expected, name
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+@pytest.mark.parametrize("strict", [True, False])
+@pytest.mark.parametrize("ignore_oscillations", [True, False])
+@pytest.mark.parametrize("ignore_steady_states", [True, False])
+def test_find_above_dense_node_limit(settings, strict, ignore_oscillations,
+                                     ignore_steady_states):
+    nc = NetworkCombinations(*settings)
+    # Every cycle is short enough to be followed
+    nc.dense_node_limit = 0
+    nc.cycle_length_limit = 1 << settings[0]
+    options = dict(strict=strict, ignore_oscillations=ignore_oscillations,
+                   ignore_steady_states=ignore_steady_states)
+    for target in TARGETS[settings[0]]:
+        found = [_key(x) for x in nc.find(target, stop=nc.get_pair_count(),
+                                          **options)]
+        assert sorted(found) == _expected(nc, target, **options)
+
+
+def test_ss_combinations_are_fixed_points():
+    nc = NetworkCombinations(4, 4, True, [0, 1], [0, 1])
+    target = ["1111", "1010"]
+    codes = [int(x, 2) for x in target]
+    found = list(nc.get_ss_combinations(target))
+    assert len(found) > 0
+    for n in found:
+        transitions = nc.get_transitions(n)
+        assert all([transitions[x] == x for x in codes])
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+def test_find_non_isomorphic(settings):
+    nc = NetworkCombinations(*settings)
+    for target in TARGETS[settings[0]]:
+        expected = set([canonical_form(x) for x in nc.find(target)])
+        found = [canonical_form(x) for x in nc.find(target,
+                                                     non_isomorphic=True)]
+        assert len(found) == len(set(found))
+        assert set(found) == expected
+
+
+def test_invalid_target():
+    nc = NetworkCombinations(3, 3)
+    with pytest.raises(ValueError):
+        list(nc.find(["11"]))
+    with pytest.raises(ValueError):
+        list(nc.find(["1a1"]))
@@ -0,0 +1,102 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Isomorphism of networks and state graphs checked with networkx
+
+import itertools as itr
+import random
+from collections import Counter
+
+import networkx as nx
+import pytest
+
+from BooleanTRN.helpers.common import canonical_form, find_isomorphic_networks
+from BooleanTRN.models.attractors import transition_signature
+from BooleanTRN.models.combinations import NetworkCombinations
+
+SETTINGS = [
+    (3, 3, True, [0, 1], [0, 1]),
+    (3, 4, False, [0, 1], [1]),
+    (4, 4, True, [0], [0, 1]),
+]
+
+
+def _graph(network, no_of_nodes: int) -> nx.DiGraph:
+    g = nx.DiGraph()
+    g.add_nodes_from(range(no_of_nodes), gate=None)
+    for start, end, interaction, gate in network:
+        g.add_edge(start, end, interaction=interaction)
+        g.nodes[end]["gate"] = gate
+    return g
+
+
+def _isomorphic(first, second, no_of_nodes: int) -> bool:
+    return nx.is_isomorphic(
+        _graph(first, no_of_nodes), _graph(second, no_of_nodes),
+        node_match=lambda x, y: x["gate"] == y["gate"],
+        edge_match=lambda x, y: x["interaction"] == y["interaction"])
+
+
+def _networks(settings: tuple) -> list:
+    return list(NetworkCombinations(*settings).get_combinations())
+
+
+@pytest.mark.parametrize("settings", SETTINGS[:2])
+def test_canonical_form_matches_networkx(settings):
+    random.seed(1)
+    networks = random.sample(_networks(settings), 80)
+    no_of_nodes = settings[0]
+    for first, second in itr.combinations(networks, 2):
+        same = canonical_form(first) == canonical_form(second)
+        assert same == _isomorphic(first, second, no_of_nodes)
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+def test_canonical_form_of_relabelled_network(settings):
+    random.seed(2)
+    no_of_nodes = settings[0]
+    for n in random.sample(_networks(settings), 50):
+        perm = random.sample(range(no_of_nodes), no_of_nodes)
+        relabelled = [(perm[x[0]], perm[x[1]], *x[2:]) for x in n]
+        assert canonical_form(n) == canonical_form(relabelled)
+
+
+def test_find_isomorphic_networks():
+    networks = _networks(SETTINGS[0])
+    unique = find_isomorphic_networks(networks)
+    for first, second in itr.combinations(unique[:60], 2):
+        assert not _isomorphic(first, second, 3)
+    assert len(unique) == len(set([canonical_form(x) for x in networks]))
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+def test_orderly_generation(settings):
+    nc = NetworkCombinations(*settings)
+    classes = Counter([canonical_form(x) for x in nc.get_combinations()])
+    representatives = list(nc.get_non_isomorphic(with_orbit_size=True))
+    keys = [canonical_form(x) for x, _ in representatives]
+    # Exactly one network from every class, orbit size is the class size
+    assert len(keys) == len(set(keys))
+    assert set(keys) == set(classes)
+    for key, (_, size) in zip(keys, representatives):
+        assert size == classes[key]
+
+
+def _state_graph(transitions) -> nx.DiGraph:
+    g = nx.DiGraph()
+    g.add_nodes_from(range(len(transitions)))
+    g.add_edges_from(enumerate(transitions.tolist()))
+    return g
+
+
+@pytest.mark.parametrize("settings", SETTINGS[:2])
+def test_transition_signature_matches_networkx(settings):
+    random.seed(3)
+    nc = NetworkCombinations(*settings)
+    tables = [nc.get_transitions(x)
+              for x in random.sample(_networks(settings), 60)]
+    for first, second in itr.combinations(tables, 2):
+        same = transition_signature(first) == transition_signature(second)
+        assert same == nx.is_isomorphic(_state_graph(first),
+                                        _state_graph(second))
@@ -0,0 +1,76 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Sharded generation of networks and its resume after interruption
+
+import os
+
+import pytest
+
+from BooleanTRN.analysis import networks
+from BooleanTRN.analysis.networks import generate_ss_networks
+
+SETTINGS = dict(no_of_nodes=3, no_of_edges=3, steady_states=["101"],
+                interactions=[0, 1], gates=[0, 1], show_progress=False)
+
+
+def _lines(filename: str) -> list:
+    with open(filename) as f:
+        return sorted(f.read().splitlines())
+
+
+def _expected(tmp_path) -> list:
+    filename = str(tmp_path / "expected.txt")
+    generate_ss_networks(**SETTINGS, filename=filename)
+    return _lines(filename)
+
+
+def _interrupt(monkeypatch, filename: str, shards: int):
+    # Run stops after every shard is scanned but before they are combined
+    def _fail(*args):
+        raise KeyboardInterrupt
+
+    with monkeypatch.context() as m:
+        m.setattr(networks.shutil, "copyfileobj", _fail)
+        with pytest.raises(KeyboardInterrupt):
+            generate_ss_networks(**SETTINGS, shards=shards, workers=2,
+                                 filename=filename)
+
+
+@pytest.mark.parametrize("shards", [1, 4, 100])
+def test_sharded_matches_single_run(tmp_path, shards):
+    filename = str(tmp_path / "networks.txt")
+    generate_ss_networks(**SETTINGS, shards=shards, workers=2,
+                         filename=filename)
+    assert _lines(filename) == _expected(tmp_path)
+    assert sorted(os.listdir(tmp_path)) == ["expected.txt", "networks.txt"]
+
+
+def test_resume_rescans_missing_shards(tmp_path, monkeypatch):
+    filename = str(tmp_path / "networks.txt")
+    _interrupt(monkeypatch, filename, 4)
+    assert os.path.exists(f"{filename}.manifest")
+    # Shard listed in the manifest is lost, e.g. by interrupted clean-up
+    os.remove(f"{filename}.shard00001")
+    generate_ss_networks(**SETTINGS, shards=4, workers=2, filename=filename)
+    assert _lines(filename) == _expected(tmp_path)
+    assert sorted(os.listdir(tmp_path)) == ["expected.txt", "networks.txt"]
+
+
+def test_resume_keeps_completed_shards(tmp_path, monkeypatch):
+    filename = str(tmp_path / "networks.txt")
+    _interrupt(monkeypatch, filename, 4)
+    # Completed shard is taken from the disk and not scanned again
+    with open(f"{filename}.shard00000", "a") as f:
+        print("marker", file=f)
+    generate_ss_networks(**SETTINGS, shards=4, workers=2, filename=filename)
+    assert _lines(filename) == sorted(_expected(tmp_path) + ["marker"])
+
+
+def test_resume_with_other_settings(tmp_path, monkeypatch):
+    filename = str(tmp_path / "networks.txt")
+    _interrupt(monkeypatch, filename, 4)
+    with pytest.raises(ValueError):
+        generate_ss_networks(**SETTINGS, shards=2, workers=2,
+                             filename=filename)
@@ -0,0 +1,74 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Mutant screens cross-checked with clamped transition tables
+
+import pytest
+
+from BooleanTRN.analysis.perturbations import (clamp_transitions,
+                                               filter_by_phenotypes,
+                                               get_mutations,
+                                               perturbation_screen)
+from BooleanTRN.models.combinations import NetworkCombinations
+
+NETWORK = [(0, 1, 1, None), (1, 2, 1, None), (2, 0, 0, None)]
+
+
+def _labels(successors: list) -> list:
+    # Smallest state of the attractor reached from every state
+    labels = []
+    for state in range(len(successors)):
+        path = [state]
+        while successors[path[-1]] not in path:
+            path.append(successors[path[-1]])
+        labels.append(min(path[path.index(successors[path[-1]]):]))
+    return labels
+
+
+def test_get_mutations():
+    mutations = get_mutations(3)
+    # 3 nodes times 2 values and 3 pairs times 4 values
+    assert len(mutations) == 6 + 12
+    assert len(set(mutations)) == len(mutations)
+
+
+def test_clamp_transitions():
+    nc = NetworkCombinations(3, 3)
+    transitions = nc.get_transitions(NETWORK)
+    clamped = clamp_transitions(transitions, [((0, 1),), ((2, 0),)], 3)
+    # Node 0 is the most significant bit, other bits are not changed
+    assert (clamped[0] & 4 == 4).all()
+    assert (clamped[0] & 3 == transitions & 3).all()
+    assert (clamped[1] & 1 == 0).all()
+    assert (clamped[1] & 6 == transitions & 6).all()
+
+
+def test_perturbation_screen():
+    nc = NetworkCombinations(3, 3)
+    transitions = nc.get_transitions(NETWORK)
+    report = perturbation_screen(transitions, 3, [((0, 1),), ((2, 0),)])
+    assert list(report) == [(), ((0, 1),), ((2, 0),)]
+    for mutation in [((0, 1),), ((2, 0),)]:
+        table = clamp_transitions(transitions, [mutation], 3)[0].tolist()
+        labels = _labels(table)
+        fractions = report[mutation]["attractors"]
+        assert sum(fractions.values()) == pytest.approx(1)
+        for attractor, fraction in fractions.items():
+            assert fraction == labels.count(min(attractor)) / 8
+
+
+def test_filter_by_phenotypes():
+    nc = NetworkCombinations(3, 3, True, [0, 1], [0, 1])
+    networks = list(nc.get_combinations())
+    phenotypes = {(): ["111"], ((0, 0),): ["011"]}
+    found = list(filter_by_phenotypes(networks, 3, phenotypes,
+                                      ignore_oscillations=True,
+                                      batch_size=50))
+    expected = []
+    for n in networks:
+        transitions = nc.get_transitions(n)
+        mutant = clamp_transitions(transitions, [((0, 0),)], 3)[0]
+        if transitions[7] == 7 and mutant[3] == 3:
+            expected.append(n)
+    assert found == expected
@@ -0,0 +1,93 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Batch rendering with the plotting function replaced by a stub
+
+import os
+
+import pytest
+
+from BooleanTRN.visualizations import rendering
+
+
+def _stub_plot(data, layout, filename, **options):
+    # Every call is logged next to the image, workers are separate
+    # processes hence the log is the only shared state
+    folder = os.path.dirname(filename)
+    with open(os.path.join(folder, "calls.log"), "a") as f:
+        print(repr(data), file=f)
+    with open(filename, "w") as f:
+        print(layout, file=f)
+
+
+def _calls(folder) -> list:
+    path = os.path.join(folder, "calls.log")
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return f.read().splitlines()
+
+
+@pytest.fixture(autouse=True)
+def stub_plots(monkeypatch):
+    # Workers are forked after the patch, hence they see the stub as well
+    monkeypatch.setitem(rendering._PLOTS, rendering.KIND_NETWORK, _stub_plot)
+    monkeypatch.setitem(rendering._PLOTS, rendering.KIND_TRANSITION,
+                        _stub_plot)
+
+
+NETWORKS = [[(0, 1, 1, 0)], [(0, 1, 0, 0)], [(1, 0, 1, 1), (0, 1, 1, 1)]]
+
+
+def test_render_all_is_eager(tmp_path):
+    folder = str(tmp_path / "plots")
+    filenames = rendering.render_all(NETWORKS, out_folder=folder, workers=2)
+    assert isinstance(filenames, list)
+    assert len(filenames) == len(NETWORKS)
+    assert len(set(filenames)) == len(NETWORKS)
+    assert all([os.path.exists(x) for x in filenames])
+    assert len(_calls(folder)) == len(NETWORKS)
+    # Temporary files are always renamed
+    assert sorted(os.listdir(folder)) == sorted(
+        [os.path.basename(x) for x in filenames] + ["calls.log"])
+
+
+def test_render_all_keeps_input_order(tmp_path):
+    folder = str(tmp_path)
+    filenames = rendering.render_all(NETWORKS, out_folder=folder, workers=2,
+                                     max_pending=1)
+    reverse = rendering.render_all(NETWORKS[::-1], out_folder=folder,
+                                   workers=2)
+    assert reverse == filenames[::-1]
+
+
+def test_render_all_skips_existing_and_repeated(tmp_path):
+    folder = str(tmp_path)
+    first = rendering.render_all(NETWORKS[:1], out_folder=folder, workers=1)
+    assert len(_calls(folder)) == 1
+    filenames = rendering.render_all(NETWORKS + NETWORKS, out_folder=folder,
+                                     workers=2)
+    assert filenames[0] == first[0]
+    assert filenames[:3] == filenames[3:]
+    # Only two new images are submitted to the workers
+    assert len(_calls(folder)) == 3
+
+
+def test_render_all_options_change_filename(tmp_path):
+    folder = str(tmp_path)
+    dot = rendering.render_all(NETWORKS[:1], out_folder=folder, workers=1)
+    neato = rendering.render_all(NETWORKS[:1], out_folder=folder, workers=1,
+                                 layout="neato")
+    assert dot != neato
+    with open(neato[0]) as f:
+        assert f.read().strip() == "neato"
+
+
+def test_render_all_validates_before_rendering(tmp_path):
+    folder = str(tmp_path / "plots")
+    with pytest.raises(ValueError):
+        rendering.render_all(NETWORKS, "unknown", out_folder=folder)
+    with pytest.raises(ValueError):
+        rendering.render_all(NETWORKS, out_folder=folder, filename="a.png")
+    assert not os.path.exists(folder)
@@ -0,0 +1,100 @@
+#  Copyright (c) 2020
+#  Rohit Suratekar, Winata Lab, IIMCB, Warsaw
+#
+#  This file is part of BooleanTRN project.
+#  Decision diagrams and symbolic attractors checked on dense tables
+
+import itertools as itr
+import random
+
+import pytest
+
+from BooleanTRN.models.attractors import find_attractors
+from BooleanTRN.models.combinations import NetworkCombinations
+from BooleanTRN.models.symbolic import BDD, symbolic_attractors
+
+SETTINGS = [
+    (3, 3, True, [0, 1], [0, 1]),
+    (4, 5, True, [0, 1], [0, 1]),
+    (5, 6, False, [0, 1], [0, 1]),
+]
+
+
+def _sample(settings: tuple, size: int = 40) -> list:
+    random.seed(settings[0] * 100 + settings[1])
+    networks = list(itr.islice(
+        NetworkCombinations(*settings).get_combinations(), 20000))
+    return random.sample(networks, min(size, len(networks)))
+
+
+def _rotated(cycle: list) -> list:
+    start = cycle.index(min(cycle))
+    return cycle[start:] + cycle[:start]
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+def test_symbolic_attractors_match_dense(settings):
+    nc = NetworkCombinations(*settings)
+    for n in _sample(settings):
+        fixed_points, cycles = find_attractors(nc.get_transitions(n))
+        length = max([len(x) for x in cycles] + [0])
+        ss, oc = symbolic_attractors(n, settings[0], length)
+        assert ss == sorted(fixed_points)
+        assert oc == sorted([_rotated(x) for x in cycles])
+
+
+def _random_function(bdd: BDD, depth: int) -> int:
+    if depth == 0:
+        return bdd.var(random.randrange(bdd.no_of_vars))
+    first = _random_function(bdd, depth - 1)
+    second = _random_function(bdd, depth - 1)
+    operation = random.choice([bdd.conjoin, bdd.disjoin, bdd.equal])
+    if random.random() < 0.3:
+        first = bdd.neg(first)
+    return operation(first, second)
+
+
+def _evaluate(bdd: BDD, f: int, values: list) -> int:
+    while f > 1:
+        f = bdd._high[f] if values[bdd._var[f]] else bdd._low[f]
+    return f
+
+
+def test_bdd_matches_truth_table():
+    random.seed(4)
+    for _ in range(30):
+        bdd = BDD(6)
+        f = _random_function(bdd, 3)
+        table = [list(x) for x in itr.product([0, 1], repeat=6)]
+        expected = [x for x in table if _evaluate(bdd, f, x) == 1]
+        assert sorted(bdd.solutions(f)) == expected
+        assert bdd.count(f) == len(expected)
+        restricted = bdd.restrict(f, {1: 1, 4: 0})
+        assert bdd.count(restricted) == 4 * len(
+            [x for x in expected if x[1] == 1 and x[4] == 0])
+
+
+def test_bdd_operations():
+    bdd = BDD(3)
+    x, y, z = [bdd.var(i) for i in range(3)]
+    assert bdd.conjoin(x, bdd.neg(x)) == 0
+    assert bdd.disjoin(x, bdd.neg(x)) == 1
+    assert bdd.count(bdd.conjoin(x, y)) == 2
+    assert bdd.count(bdd.disjoin(bdd.conjoin(x, y), z)) == 5
+    assert bdd.equal(bdd.conjoin(x, y), bdd.conjoin(y, x)) == 1
+    with pytest.raises(ValueError):
+        bdd.var(3)
+
+
+def test_bdd_deep_diagram():
+    # Diagrams much deeper than the recursion limit
+    bdd = BDD(5000)
+    even, odd = 1, 1
+    for i in reversed(range(0, 5000, 2)):
+        even = bdd.conjoin(bdd.var(i), even)
+        odd = bdd.conjoin(bdd.var(i + 1), odd)
+    f = bdd.conjoin(even, odd)
+    assert bdd.count(f) == 1
+    assert next(bdd.solutions(f)) == [1] * 5000
+    assert bdd.restrict(f, {0: 1, 4999: 1}) != 0
+    assert bdd.restrict(f, {2500: 0}) == 0